@@ -0,0 +1,68 @@
+import argparse
+import json
+import platform
+import sys
+from typing import Any
+
+from benchmarks.suite import get_engine_benchmarks, get_render_benchmarks, measure
+
+
+def run(min_time: float, render: bool) -> dict[str, float]:
+    benchmarks = list(get_engine_benchmarks())
+    if render:
+        benchmarks += get_render_benchmarks()
+
+    results = {}
+    for name, function, operations in benchmarks:
+        results[name] = measure(function, operations, min_time)
+        print(f"{name:<24} {results[name]:>14,.1f} ops/s", file=sys.stderr)
+    return results
+
+
+def compare(
+    baseline: dict[str, float], results: dict[str, float], threshold: float
+) -> list[str]:
+    """Return the benchmarks slower than in `baseline` by more than
+    `threshold`, as a fraction of the baseline speed."""
+    regressions = []
+    for name, speed in results.items():
+        if name in baseline and speed < baseline[name] * (1 - threshold):
+            regressions.append(
+                f"{name}: {speed:,.1f} ops/s, {baseline[name]:,.1f} in the baseline"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="benchmarks", description="Measure the operations per second of hot paths."
+    )
+    parser.add_argument("--output", help="JSON file to write the results to")
+    parser.add_argument("--compare", help="JSON baseline to compare the results to")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--no-render", action="store_true")
+    arguments = parser.parse_args()
+
+    results = run(arguments.min_time, not arguments.no_render)
+    report: dict[str, Any] = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if arguments.compare:
+        with open(arguments.compare) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(baseline, results, arguments.threshold)
+        for regression in regressions:
+            print(f"regression: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import argparse
+import json
+import sys
+
+from benchmarks.suite import SIZES
+from logic.memory import REPRESENTATIONS, get_memory_report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="benchmarks.memory",
+        description="Measure the bytes per state of each representation.",
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--output", help="JSON file to write the report to")
+    arguments = parser.parse_args()
+
+    report = get_memory_report(arguments.sizes)
+    header = "".join(f"{name:>14}" for name in REPRESENTATIONS)
+    print(f"{'size':>6}{header}", file=sys.stderr)
+    for size in arguments.sizes:
+        row = "".join(f"{report[name][size]:>14,.0f}" for name in REPRESENTATIONS)
+        print(f"{size:>6}{row}", file=sys.stderr)
+
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
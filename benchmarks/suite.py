@@ -0,0 +1,100 @@
+import random
+import time
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Iterator
+
+import numpy as np
+
+from logic.enums import Axis
+from logic.environment import VectorEnv
+from logic.move import Move
+from logic.rubiks_cube import RubiksCube
+
+if TYPE_CHECKING:
+    from ui.display import RubiksCubeDisplay
+
+SIZES = [2, 3, 5, 10, 20, 50]
+RENDER_SIZES = [3, 10, 20]
+ENV_SIZES = [2, 3, 5]
+ENV_COUNT = 10_000
+
+Benchmark = tuple[str, Callable[[], object], int]
+
+
+def measure(function: Callable[[], object], operations: int, min_time: float) -> float:
+    """Return the best number of operations per second of `function`, each
+    call doing `operations` of them, over 3 runs of at least `min_time`."""
+    best = 0.0
+    for _ in range(3):
+        calls = 0
+        start = time.perf_counter()
+        while (elapsed := time.perf_counter() - start) < min_time or not calls:
+            function()
+            calls += 1
+        best = max(best, calls * operations / elapsed)
+    return best
+
+
+def get_engine_benchmarks() -> Iterator[Benchmark]:
+    for size in SIZES:
+        rubiks_cube = RubiksCube(size)
+        numbers = [random.randrange(size) for _ in range(100)]
+
+        for name, rotate in [
+            ("rotate_slice", rubiks_cube.rotate_slice),
+            ("rotate_row", rubiks_cube.rotate_row),
+            ("rotate_column", rubiks_cube.rotate_column),
+        ]:
+            yield f"{name}[{size}]", partial(_rotate, rotate, numbers), len(numbers)
+
+        yield f"is_finished[{size}]", rubiks_cube.is_finished, 1
+        yield f"reset[{size}]", rubiks_cube.reset, 1
+        yield f"shuffle[{size}]", partial(_shuffle, rubiks_cube, 100), 100
+
+    # environments stepped per second, all of them by each call
+    for size in ENV_SIZES:
+        env = VectorEnv(size, seed=0)
+        env.reset(ENV_COUNT)
+        actions = np.random.default_rng(0).integers(
+            env.number_of_actions, size=ENV_COUNT
+        )
+        yield f"env_step[{size}]", partial(env.step, actions), ENV_COUNT
+
+
+def get_render_benchmarks() -> Iterator[Benchmark]:
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    from ui.display import RubiksCubeDisplay
+
+    for size in RENDER_SIZES:
+        figure = Figure()
+        canvas = FigureCanvasAgg(figure)
+        display = RubiksCubeDisplay(RubiksCube(size), 0.9 / size, 6, figure=figure)
+        display._add_cubes_to_ax()
+        canvas.draw()  # type: ignore
+
+        # a frame of an animated move, only the turning layer being redrawn
+        move = Move(Axis.SLICE, 0)
+        display._start_move(move, 0.0)
+        yield f"animation_frame[{size}]", partial(_animate, display, move), 1
+
+        # a whole frame, as drawn when exporting
+        facelets = display.rubiks_cube.get_facelets()
+        yield f"pose_frame[{size}]", partial(display.draw_pose, facelets, move, 3), 1
+
+
+def _rotate(rotate: Callable[[int], None], numbers: list[int]) -> None:
+    for number in numbers:
+        rotate(number)
+
+
+def _shuffle(rubiks_cube: RubiksCube, number_of_rotations: int) -> None:
+    for _ in rubiks_cube.shuffle(number_of_rotations):
+        pass
+
+
+def _animate(display: "RubiksCubeDisplay", move: Move) -> None:
+    display.current_step = (display.current_step + 1) % display.number_of_frames
+    display._rotate_faces(display.current_faces, move, display.current_step)
+    display._blit_layer()
@@ -0,0 +1,280 @@
+import argparse
+import itertools
+import json
+import sys
+from typing import Any, Callable, Iterable, Iterator, Optional, TextIO
+
+import numpy as np
+
+import settings
+from logic.analysis import analyze_algorithm
+from logic.facelet_string import from_facelet_string, to_facelet_string
+from logic.facelets import apply_algorithms, are_solved, get_solved_facelets
+from logic.move import AXES, Move, format_moves, parse_moves
+from logic.solver import solve
+from logic.validation import get_state_errors, validate_states
+
+Record = dict[str, Any]
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Run a subcommand, or open the display when there is none.
+
+    Subcommands other than `scramble` read one record per line from stdin,
+    either a JSON object or plain notation, and write one JSON object per
+    record to stdout. Records are handled by batches of `--batch-size`, each
+    batch being written as soon as it's done, so that memory doesn't grow with
+    the length of the input.
+    """
+    parser = _get_parser()
+    arguments = parser.parse_args(argv)
+    if arguments.command is None:
+        _display()
+        return
+
+    if arguments.command == "serve":
+        _serve(arguments)
+        return
+
+    if arguments.command == "scramble":
+        records: Iterable[Record] = _generate_scrambles(arguments)
+    else:
+        key = "moves" if arguments.command in ("apply", "stats") else "state"
+        records = (_parse_record(line, key) for line in sys.stdin if line.strip())
+
+    handle = COMMANDS[arguments.command]
+    for batch in _get_batches(records, arguments.batch_size):
+        _write_records(sys.stdout, handle(batch, arguments))
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="rubiks-cube", description=main.__doc__)
+    subparsers = parser.add_subparsers(dest="command")
+
+    def add_command(name: str, help: str) -> argparse.ArgumentParser:
+        subparser = subparsers.add_parser(name, help=help)
+        subparser.add_argument("--batch-size", type=_positive_int, default=256)
+        return subparser
+
+    scramble = add_command("scramble", "generate scrambled states")
+    scramble.add_argument(
+        "--size", type=_positive_int, default=settings.RUBIKS_CUBE_SIZE
+    )
+    scramble.add_argument(
+        "--moves", type=int, default=settings.SHUFFLE_NUMBER_OF_ROTATIONS
+    )
+    scramble.add_argument("--count", type=int, default=1)
+    scramble.add_argument("--seed", type=int)
+
+    apply = add_command("apply", "apply moves to states, solved by default")
+    apply.add_argument("--size", type=_positive_int, default=settings.RUBIKS_CUBE_SIZE)
+
+    add_command("verify", "check that states can be reached from a solved cube")
+
+    solve = add_command(
+        "solve",
+        "find the shortest solution of states, or null past the depth or node "
+        "budget; each state is searched on its own, as the search doesn't batch",
+    )
+    solve.add_argument("--max-depth", type=int, default=7)
+    solve.add_argument(
+        "--max-nodes",
+        type=int,
+        default=10_000,
+        help="states expanded per search before giving up, about 1 s for a 3x3x3",
+    )
+
+    stats = add_command("stats", "compute the order and cycles of algorithms")
+    stats.add_argument("--size", type=_positive_int, default=settings.RUBIKS_CUBE_SIZE)
+
+    serve = subparsers.add_parser("serve", help="serve cube sessions over JSON-RPC")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    return parser
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"{value!r} must be greater than 0")
+    return number
+
+
+def _display() -> None:
+    from logic.rubiks_cube import RubiksCube
+    from ui import RubiksCubeDisplay
+
+    rubiks_cube = RubiksCube(settings.RUBIKS_CUBE_SIZE)
+    RubiksCubeDisplay(
+        rubiks_cube, settings.CUBE_SIZE, settings.NUMBER_OF_FRAMES
+    ).display()
+
+
+def _serve(arguments: argparse.Namespace) -> None:
+    import asyncio
+
+    from service import serve
+
+    asyncio.run(serve(arguments.host, arguments.port))
+
+
+def _parse_record(line: str, key: str) -> Record:
+    line = line.strip()
+    if not line.startswith("{"):
+        return {key: line}
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as error:
+        return {"error": f"invalid JSON: {error}"}
+    if not isinstance(record, dict):
+        return {"error": "records must be JSON objects"}
+    return record
+
+
+def _get_batches(records: Iterable[Record], size: int) -> Iterator[list[Record]]:
+    records = iter(records)
+    while batch := list(itertools.islice(records, size)):
+        yield batch
+
+
+def _write_records(stream: TextIO, records: Iterable[Record]) -> None:
+    for record in records:
+        stream.write(json.dumps(record) + "\n")
+    stream.flush()
+
+
+def _group_states(
+    batch: list[Record], default_size: Optional[int] = None
+) -> dict[int, tuple[list[int], np.ndarray]]:
+    # Parses the states of the batch by size, along with the indices of their
+    # records, records without a state holding a solved cube of
+    # `default_size` and records with an invalid one getting an error
+    groups: dict[int, tuple[list[int], list[np.ndarray]]] = {}
+    for index, record in enumerate(batch):
+        if "error" in record:
+            continue
+        if "state" in record:
+            try:
+                facelets = from_facelet_string(str(record["state"]))
+            except ValueError as error:
+                record["error"] = str(error)
+                continue
+        elif default_size is not None:
+            facelets = get_solved_facelets(default_size)
+        else:
+            record["error"] = "missing state"
+            continue
+
+        indices, states = groups.setdefault(facelets.shape[-1], ([], []))
+        indices.append(index)
+        states.append(facelets)
+
+    return {
+        size: (indices, np.stack(states)) for size, (indices, states) in groups.items()
+    }
+
+
+def _parse_algorithms(batch: list[Record]) -> list[list[Move]]:
+    algorithms = []
+    for record in batch:
+        moves: list[Move] = []
+        if "error" not in record:
+            try:
+                moves = parse_moves(str(record.get("moves", "")))
+            except ValueError as error:
+                record["error"] = str(error)
+        algorithms.append(moves)
+    return algorithms
+
+
+def _generate_scrambles(arguments: argparse.Namespace) -> Iterator[Record]:
+    generator = np.random.default_rng(arguments.seed)
+    for _ in range(arguments.count):
+        axes = generator.integers(len(AXES), size=arguments.moves)
+        numbers = generator.integers(arguments.size, size=arguments.moves)
+        moves = [Move(AXES[axis], int(number)) for axis, number in zip(axes, numbers)]
+        yield {"moves": format_moves(moves)}
+
+
+def _scramble(batch: list[Record], arguments: argparse.Namespace) -> list[Record]:
+    algorithms = _parse_algorithms(batch)
+    solved = get_solved_facelets(arguments.size)
+    states = apply_algorithms(np.stack([solved] * len(batch)), algorithms)
+    return [
+        {"moves": record["moves"], "state": to_facelet_string(state)}
+        for record, state in zip(batch, states)
+    ]
+
+
+def _apply(batch: list[Record], arguments: argparse.Namespace) -> list[Record]:
+    algorithms = _parse_algorithms(batch)
+    for size, (indices, states) in _group_states(batch, arguments.size).items():
+        for index in indices:
+            if any(move.number >= size for move in algorithms[index]):
+                batch[index]["error"] = f"moves must turn layers below {size}"
+                algorithms[index] = []
+
+        states = apply_algorithms(states, [algorithms[index] for index in indices])
+        finished = are_solved(states)
+        for index, state, is_finished in zip(indices, states, finished):
+            if "error" in batch[index]:
+                continue
+            batch[index] = {
+                "state": to_facelet_string(state),
+                "finished": bool(is_finished),
+            }
+    return batch
+
+
+def _verify(batch: list[Record], arguments: argparse.Namespace) -> list[Record]:
+    for indices, states in _group_states(batch).values():
+        for index, state, is_valid in zip(indices, states, validate_states(states)):
+            batch[index] = {
+                "state": batch[index]["state"],
+                "valid": bool(is_valid),
+                "errors": [] if is_valid else get_state_errors(state),
+            }
+    return batch
+
+
+def _solve(batch: list[Record], arguments: argparse.Namespace) -> list[Record]:
+    for indices, states in _group_states(batch).values():
+        for index, state in zip(indices, states):
+            solution = solve(
+                state, max_depth=arguments.max_depth, max_nodes=arguments.max_nodes
+            )
+            batch[index] = {
+                "state": batch[index]["state"],
+                "solution": None if solution is None else format_moves(solution),
+            }
+    return batch
+
+
+def _stats(batch: list[Record], arguments: argparse.Namespace) -> list[Record]:
+    results = []
+    for record, moves in zip(batch, _parse_algorithms(batch)):
+        if "error" in record:
+            results.append(record)
+            continue
+        try:
+            analysis = analyze_algorithm(arguments.size, moves)
+        except ValueError as error:
+            results.append({**record, "error": str(error)})
+            continue
+        results.append(
+            {
+                "moves": format_moves(moves),
+                "order": analysis.order,
+                "cycles": sorted(len(cycle) for cycle in analysis.cycles),
+            }
+        )
+    return results
+
+
+COMMANDS: dict[str, Callable[[list[Record], argparse.Namespace], list[Record]]] = {
+    "scramble": _scramble,
+    "apply": _apply,
+    "verify": _verify,
+    "solve": _solve,
+    "stats": _stats,
+}
@@ -0,0 +1,44 @@
+import math
+from typing import Iterable, NamedTuple
+
+import numpy as np
+
+from .facelets import get_algorithm_permutation
+from .move import Move
+
+
+class AlgorithmAnalysis(NamedTuple):
+    order: int
+    cycles: list[tuple[int, ...]]
+
+
+def get_cycles(permutation: np.ndarray) -> list[tuple[int, ...]]:
+    """Decompose `permutation` into its cycles, leaving out fixed points."""
+    visited = permutation == np.arange(permutation.size)
+    cycles = []
+
+    for start in np.flatnonzero(~visited):
+        if visited[start]:
+            continue
+
+        cycle = []
+        index = int(start)
+        while not visited[index]:
+            visited[index] = True
+            cycle.append(index)
+            index = int(permutation[index])
+        cycles.append(tuple(cycle))
+
+    return cycles
+
+
+def analyze_algorithm(size: int, moves: Iterable[Move]) -> AlgorithmAnalysis:
+    """Return the order and facelet cycles of `moves` applied in order.
+
+    The order is the number of times the algorithm must be repeated to get
+    back to the starting state, and is computed as the least common multiple
+    of its cycle lengths.
+    """
+    cycles = get_cycles(get_algorithm_permutation(size, moves))
+    order = math.lcm(*(len(cycle) for cycle in cycles)) if cycles else 1
+    return AlgorithmAnalysis(order, cycles)
@@ -1,2 +1,3 @@
+from .axis import Axis  # noqa
 from .colors import Color  # noqa
 from .faces import Face  # noqa
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class Axis(Enum):
+    SLICE = "slice"
+    ROW = "row"
+    COLUMN = "column"
@@ -0,0 +1,105 @@
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from .facelets import FACES, are_solved, get_move_permutation, get_solved_facelets
+from .move import AXES, Move
+
+
+class StepResult(NamedTuple):
+    observations: np.ndarray
+    rewards: np.ndarray
+    terminated: np.ndarray
+    truncated: np.ndarray
+
+
+class VectorEnv:
+    """Gym-like environments of Rubik's cubes of `size`, stepped all at once.
+
+    The states of all the environments are held by a single (count, 6 * size *
+    size) array of color codes, each step being one gather through the
+    permutations of the actions. Actions are the codes of the moves, as given
+    by `Move.encode`, and the reward is 1 for solving the cube, 0 otherwise.
+
+    Episodes end when the cube is solved, or are truncated after `max_steps`.
+    Finished environments are reset right away with a new scramble of
+    `scramble_moves` moves, so the observations returned for them are the
+    first ones of their next episode.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        scramble_moves: int = 20,
+        max_steps: int = 100,
+        seed: Optional[int] = None,
+    ) -> None:
+        if size <= 0:
+            raise ValueError("'size' must be greater than 0")
+        if max_steps <= 0:
+            raise ValueError("'max_steps' must be greater than 0")
+
+        self.size = size
+        self.scramble_moves = scramble_moves
+        self.max_steps = max_steps
+        self.number_of_actions = len(AXES) * size
+        self.permutations = np.stack(
+            [
+                get_move_permutation(size, Move.decode(code))
+                for code in range(self.number_of_actions)
+            ]
+        ).astype(np.intp)
+        self.solved = get_solved_facelets(size).reshape(-1)
+        self.generator = np.random.default_rng(seed)
+        self.states = np.empty((0, self.solved.size), dtype=np.uint8)
+        self.steps = np.zeros(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def reset(self, count: int, seed: Optional[int] = None) -> np.ndarray:
+        """Start `count` new episodes from scrambled cubes and return their
+        (count, 6, size, size) observations."""
+        if seed is not None:
+            self.generator = np.random.default_rng(seed)
+        self.states = self._scramble(count)
+        self.steps = np.zeros(count, dtype=np.int64)
+        return self._get_observations()
+
+    def step(self, actions: np.ndarray) -> StepResult:
+        """Apply the move of code `actions[i]` to the cube of environment `i`."""
+        actions = np.asarray(actions)
+        if actions.shape != (len(self),):
+            raise ValueError(f"'actions' must be of shape {(len(self),)}")
+        if not np.all((actions >= 0) & (actions < self.number_of_actions)):
+            raise ValueError(
+                f"'actions' must be between 0 and {self.number_of_actions - 1}"
+            )
+
+        self.states = np.take_along_axis(self.states, self.permutations[actions], 1)
+        self.steps += 1
+        terminated = are_solved(self.states)
+        truncated = ~terminated & (self.steps >= self.max_steps)
+
+        finished = np.flatnonzero(terminated | truncated)
+        if finished.size:
+            self.states[finished] = self._scramble(finished.size)
+            self.steps[finished] = 0
+        return StepResult(
+            self._get_observations(),
+            terminated.astype(np.float32),
+            terminated,
+            truncated,
+        )
+
+    def _scramble(self, count: int) -> np.ndarray:
+        states = np.tile(self.solved, (count, 1))
+        actions = self.generator.integers(
+            self.number_of_actions, size=(self.scramble_moves, count)
+        )
+        for moves in actions:
+            states = np.take_along_axis(states, self.permutations[moves], 1)
+        return states
+
+    def _get_observations(self) -> np.ndarray:
+        return self.states.reshape(len(self), len(FACES), self.size, self.size).copy()
@@ -0,0 +1,97 @@
+import math
+import os
+from typing import Union
+
+import numpy as np
+
+from .enums import Face
+from .facelets import COLOR_CODES, FACES, SOLVED_COLORS
+
+# Faces in the order of the standard URFDLB facelet string, and the letter
+# standing for each of them (and for the color of their solved stickers).
+FACE_LETTERS = {
+    Face.TOP: "U",
+    Face.RIGHT: "R",
+    Face.FRONT: "F",
+    Face.BOTTOM: "D",
+    Face.LEFT: "L",
+    Face.BACK: "B",
+}
+STRING_FACES = [FACES.index(face) for face in FACE_LETTERS]
+FACELETS_FACES = [list(FACE_LETTERS).index(face) for face in FACES]
+
+INVALID_CODE = 255
+LETTER_CODES = np.full(256, INVALID_CODE, dtype=np.uint8)
+CODE_LETTERS = np.zeros(len(COLOR_CODES), dtype=np.uint8)
+for face, letter in FACE_LETTERS.items():
+    LETTER_CODES[ord(letter)] = COLOR_CODES[SOLVED_COLORS[face]]
+    CODE_LETTERS[COLOR_CODES[SOLVED_COLORS[face]]] = ord(letter)
+
+
+def _get_size(length: int) -> int:
+    size = math.isqrt(length // len(FACES))
+    if size == 0 or len(FACES) * size * size != length:
+        raise ValueError(f"{length} is not a valid facelet string length")
+    return size
+
+
+def from_facelet_string(text: str) -> np.ndarray:
+    """Return the (6, size, size) facelets described by a URFDLB facelet
+    string of 6 * size * size characters."""
+    facelets: np.ndarray = parse_facelet_strings(text.encode())[0]
+    return facelets
+
+
+def to_facelet_string(facelets: np.ndarray) -> str:
+    """Return the URFDLB facelet string describing the (6, size, size)
+    `facelets`."""
+    return format_facelet_strings(facelets[np.newaxis]).decode().rstrip("\n")
+
+
+def parse_facelet_strings(data: bytes) -> np.ndarray:
+    """Return the (count, 6, size, size) states described by newline
+    separated facelet strings, all of the same size.
+
+    Characters are translated to color codes through a lookup table over the
+    raw bytes, so that no Python code runs per line or per character.
+    """
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if raw.size and raw[-1] != ord("\n"):
+        raw = np.append(raw, np.uint8(ord("\n")))
+
+    line_ends = np.flatnonzero(raw == ord("\n"))
+    if line_ends.size == 0:
+        raise ValueError("no facelet string found")
+
+    width = int(line_ends[0]) + 1
+    if raw.size != width * line_ends.size or np.any(
+        line_ends != np.arange(width - 1, raw.size, width)
+    ):
+        raise ValueError("facelet strings must all have the same length")
+
+    lines = raw.reshape(-1, width)[:, : width - 1]
+    if lines.shape[1] and np.all(lines[:, -1] == ord("\r")):
+        lines = lines[:, :-1]
+
+    size = _get_size(lines.shape[1])
+    states = LETTER_CODES[lines]
+    invalid_lines = np.flatnonzero(np.any(states == INVALID_CODE, axis=1))
+    if invalid_lines.size:
+        raise ValueError(f"line {invalid_lines[0] + 1} has invalid characters")
+
+    states = states.reshape(-1, len(FACES), size, size)
+    return np.ascontiguousarray(states[:, FACELETS_FACES])
+
+
+def format_facelet_strings(states: np.ndarray) -> bytes:
+    """Return the newline terminated facelet strings of the (count, 6, size,
+    size) `states`."""
+    letters = CODE_LETTERS[states[:, STRING_FACES]].reshape(len(states), -1)
+    newlines = np.full((len(states), 1), ord("\n"), dtype=np.uint8)
+    return np.hstack([letters, newlines]).tobytes()
+
+
+def load_facelet_strings(path: Union[str, os.PathLike[str]]) -> np.ndarray:
+    """Return the states described by the facelet strings of a file."""
+    with open(path, "rb") as file:
+        return parse_facelet_strings(file.read())
@@ -0,0 +1,337 @@
+import math
+from functools import lru_cache
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from .enums import Axis, Color, Face
+from .move import Move
+
+FACES = list(Face)
+COLORS = [color for color in Color if color is not Color.BLACK]
+COLOR_CODES = {color: code for code, color in enumerate(Color)}
+
+SOLVED_COLORS = {
+    Face.FRONT: Color.ORANGE,
+    Face.RIGHT: Color.GREEN,
+    Face.BACK: Color.RED,
+    Face.LEFT: Color.BLUE,
+    Face.BOTTOM: Color.WHITE,
+    Face.TOP: Color.YELLOW,
+}
+
+# Outward (x, y, z) normal of each face, in `FACES` order.
+NORMALS = np.array(
+    [[0, -1, 0], [1, 0, 0], [0, 1, 0], [-1, 0, 0], [0, 0, -1], [0, 0, 1]]
+)
+
+# Source face of each destination face (in `FACES` order) for the sticker
+# rotations of `Cube.rotate_xz`, `Cube.rotate_xy` and `Cube.rotate_yz`.
+XZ_SOURCES = [0, 4, 2, 5, 3, 1]
+XY_SOURCES = [1, 2, 3, 0, 4, 5]
+YZ_SOURCES = [4, 1, 5, 3, 2, 0]
+
+# Color codes of the facelets, BLACK excluded, fit in 3 bits
+BITS_PER_FACELET = 3
+
+# Edge facelets are ordered top/bottom first, then front/back, then left/right.
+EDGE_PRIORITIES = [1, 2, 1, 2, 0, 0]
+
+
+@lru_cache(maxsize=None)
+def get_facelet_coordinates(size: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return the (y, z, x) coordinates of the cube holding each facelet.
+
+    Facelets are laid out as a (6, size, size) array in `FACES` order, each
+    face being seen from the outside with the top face seen with the back
+    face up and the bottom face seen with the front face up.
+    """
+    last = size - 1
+    rows, columns = np.indices((size, size))
+    zero, full = np.zeros_like(rows), np.full_like(rows, last)
+
+    ys = np.stack([zero, columns, full, last - columns, rows, last - rows])
+    zs = np.stack([last - rows] * 4 + [zero, full])
+    xs = np.stack([columns, full, last - columns, zero, columns, columns])
+
+    for coordinates in (ys, zs, xs):
+        coordinates.setflags(write=False)
+    return ys, zs, xs
+
+
+@lru_cache(maxsize=None)
+def get_move_permutation(size: int, move: Move) -> np.ndarray:
+    """Return the permutation applied to the flattened facelets by `move`.
+
+    After the move, facelet `i` holds what facelet `permutation[i]` held.
+    """
+    targets, sources = get_moved_facelets(size, move)
+    permutation: np.ndarray = np.arange(len(FACES) * size * size)
+    permutation[targets] = sources
+    permutation.setflags(write=False)
+    return permutation
+
+
+@lru_cache(maxsize=None)
+def get_moved_facelets(size: int, move: Move) -> tuple[np.ndarray, np.ndarray]:
+    """Return the flattened facelets changed by `move` and the facelets they
+    take their colors from, to only touch the turning layer.
+
+    Only the facelets of the layer are looked at, the facelet a target takes
+    its color from being found by its coordinates before the turn.
+    """
+    if not 0 <= move.number < size:
+        raise ValueError(f"'number' must be between 0 and {size - 1}")
+
+    ys, zs, xs = (coordinates.ravel() for coordinates in get_facelet_coordinates(size))
+    faces = np.repeat(np.arange(len(FACES)), size * size)
+    last = size - 1
+    if move.axis is Axis.SLICE:
+        layer = np.flatnonzero(ys == move.number)
+        y, z, x = ys[layer], zs[layer], xs[layer]
+        source_coordinates = (y, last - x, z)
+        face_sources = XZ_SOURCES
+    elif move.axis is Axis.ROW:
+        layer = np.flatnonzero(zs == move.number)
+        y, z, x = ys[layer], zs[layer], xs[layer]
+        source_coordinates = (x, z, last - y)
+        face_sources = XY_SOURCES
+    else:
+        layer = np.flatnonzero(xs == move.number)
+        y, z, x = ys[layer], zs[layer], xs[layer]
+        source_coordinates = (last - z, y, x)
+        face_sources = YZ_SOURCES
+
+    def get_keys(
+        y: np.ndarray, z: np.ndarray, x: np.ndarray, face: np.ndarray
+    ) -> np.ndarray:
+        keys: np.ndarray = ((y * size + z) * size + x) * len(FACES) + face
+        return keys
+
+    keys = get_keys(y, z, x, faces[layer])
+    order = np.argsort(keys)
+    source_keys = get_keys(*source_coordinates, np.array(face_sources)[faces[layer]])
+    sources = layer[order[np.searchsorted(keys[order], source_keys)]]
+
+    is_moved = sources != layer
+    targets, sources = layer[is_moved], sources[is_moved]
+    targets.setflags(write=False)
+    sources.setflags(write=False)
+    return targets, sources
+
+
+def get_algorithm_permutation(size: int, moves: Iterable[Move]) -> np.ndarray:
+    """Return the facelet permutation of `moves` applied in order."""
+    permutation: np.ndarray = np.arange(len(FACES) * size * size)
+    for move in moves:
+        permutation = permutation[get_move_permutation(size, move)]
+    return permutation
+
+
+def apply_algorithms(
+    states: np.ndarray, algorithms: Sequence[Sequence[Move]]
+) -> np.ndarray:
+    """Return the (count, 6, size, size) `states` with each algorithm applied
+    to the state of the same index.
+
+    The moves at the same index in all the algorithms are applied together by
+    a single gather, shorter algorithms being padded with the identity.
+    """
+    size = states.shape[-1]
+    flat_states = states.reshape(len(states), len(FACES) * size * size)
+    identity = np.arange(flat_states.shape[1])
+    for index in range(max((len(moves) for moves in algorithms), default=0)):
+        permutations = np.stack(
+            [
+                get_move_permutation(size, moves[index])
+                if index < len(moves)
+                else identity
+                for moves in algorithms
+            ]
+        )
+        flat_states = np.take_along_axis(flat_states, permutations, axis=1)
+    return flat_states.reshape(states.shape)
+
+
+def pack_states(states: np.ndarray) -> np.ndarray:
+    """Return the (count, 6, size, size) `states` packed into 3 bits per
+    facelet, one row of bytes per state."""
+    size = states.shape[-1]
+    number_of_facelets = len(FACES) * size * size
+    flat_states = states.reshape(len(states), number_of_facelets)
+    shifts = np.arange(BITS_PER_FACELET - 1, -1, -1, dtype=np.uint8)
+    bits = (flat_states[..., np.newaxis] >> shifts) & 1
+    return np.packbits(
+        bits.reshape(len(states), number_of_facelets * BITS_PER_FACELET), axis=1
+    )
+
+
+def unpack_states(packed: np.ndarray, size: int) -> np.ndarray:
+    """Return the (count, 6, size, size) states packed by `pack_states`."""
+    number_of_facelets = len(FACES) * size * size
+    bits = np.unpackbits(
+        packed, axis=1, count=number_of_facelets * BITS_PER_FACELET
+    ).reshape(len(packed), number_of_facelets, BITS_PER_FACELET)
+    states: np.ndarray = np.zeros((len(packed), number_of_facelets), dtype=np.uint8)
+    for bit in range(BITS_PER_FACELET):
+        states = (states << 1) | bits[..., bit]
+    return states.reshape(len(packed), len(FACES), size, size)
+
+
+def get_solved_faces(states: np.ndarray) -> np.ndarray:
+    """Return whether each face of the (count, 6, size, size) `states`, or of
+    their flattened facelets, has a single color."""
+    facelets_per_face = math.prod(states.shape[1:]) // len(FACES)
+    faces = states.reshape(len(states), len(FACES), facelets_per_face)
+    solved_faces: np.ndarray = np.all(faces == faces[..., :1], axis=-1)
+    return solved_faces
+
+
+def are_solved(states: np.ndarray) -> np.ndarray:
+    """Return whether each of the (count, 6, size, size) `states`, or of their
+    flattened facelets, is solved, whatever the orientation of the cube."""
+    are_solved: np.ndarray = np.all(get_solved_faces(states), axis=1)
+    return are_solved
+
+
+@lru_cache(maxsize=None)
+def get_solved_facelets(size: int) -> np.ndarray:
+    """Return the color codes of the facelets of a solved cube."""
+    codes = [COLOR_CODES[SOLVED_COLORS[face]] for face in FACES]
+    facelets = np.repeat(np.array(codes, dtype=np.uint8), size * size).reshape(
+        len(FACES), size, size
+    )
+    facelets.setflags(write=False)
+    return facelets
+
+
+@lru_cache(maxsize=None)
+def get_facelet_orbits(size: int) -> np.ndarray:
+    """Return, for each flattened facelet, the smallest facelet it can be
+    moved to, which identifies the orbit it belongs to."""
+    orbits = np.arange(len(FACES) * size * size)
+    permutations = [
+        get_move_permutation(size, Move(axis, number))
+        for axis in Axis
+        for number in range(size)
+    ]
+
+    previous = None
+    while previous is None or not np.array_equal(previous, orbits):
+        previous = orbits.copy()
+        for permutation in permutations:
+            np.minimum(orbits, orbits[permutation], out=orbits)
+
+    orbits.setflags(write=False)
+    return orbits
+
+
+@lru_cache(maxsize=None)
+def _get_facelets_by_cube(size: int) -> dict[tuple[int, int, int], list[int]]:
+    ys, zs, xs = get_facelet_coordinates(size)
+    facelets_by_cube: dict[tuple[int, int, int], list[int]] = {}
+    for index, (y, z, x) in enumerate(zip(ys.flat, zs.flat, xs.flat)):
+        facelets_by_cube.setdefault((int(y), int(z), int(x)), []).append(index)
+    return facelets_by_cube
+
+
+@lru_cache(maxsize=None)
+def get_cube_facelets(size: int) -> np.ndarray:
+    """Return the flattened facelets of each outer cube, one row per cube,
+    padded with -1 for the cubes with fewer facelets than the others."""
+    facelets_by_cube = list(_get_facelets_by_cube(size).values())
+    width = max(len(facelets) for facelets in facelets_by_cube)
+    cube_facelets = np.full((len(facelets_by_cube), width), -1)
+    for index, facelets in enumerate(facelets_by_cube):
+        cube_facelets[index, : len(facelets)] = facelets
+    cube_facelets.setflags(write=False)
+    return cube_facelets
+
+
+def _get_face(facelet: int, size: int) -> int:
+    return facelet // (size * size)
+
+
+@lru_cache(maxsize=None)
+def get_corner_facelets(size: int) -> np.ndarray:
+    """Return the (8, 3) flattened facelets of each corner, starting with the
+    top or bottom facelet and going clockwise."""
+    if size < 2:
+        return np.empty((0, 3), dtype=int)
+
+    corners = []
+    for facelets in _get_facelets_by_cube(size).values():
+        if len(facelets) != 3:
+            continue
+
+        first, second, third = sorted(
+            facelets, key=lambda facelet: -abs(NORMALS[_get_face(facelet, size), 2])
+        )
+        normals = NORMALS[[_get_face(f, size) for f in (first, second, third)]]
+        if np.linalg.det(normals) > 0:
+            second, third = third, second
+        corners.append([first, second, third])
+
+    return np.array(corners)
+
+
+def _get_edges(size: int) -> list[tuple[int, list[int]]]:
+    # Each edge cube along with its coordinate along the edge
+    edges = []
+    for cube, facelets in _get_facelets_by_cube(size).items():
+        if len(facelets) == 2:
+            (coordinate,) = [c for c in cube if 0 < c < size - 1]
+            edges.append((coordinate, facelets))
+    return edges
+
+
+@lru_cache(maxsize=None)
+def get_edge_facelets(size: int) -> np.ndarray:
+    """Return the (12, 2) flattened facelets of each middle edge of an odd
+    cube, starting with the top or bottom facelet, else the front or back
+    one."""
+    edges = []
+    for coordinate, facelets in _get_edges(size):
+        if 2 * coordinate == size - 1:
+            edges.append(
+                sorted(facelets, key=lambda f: EDGE_PRIORITIES[_get_face(f, size)])
+            )
+    return np.array(edges, dtype=int).reshape(-1, 2)
+
+
+@lru_cache(maxsize=None)
+def get_wing_facelets(size: int) -> np.ndarray:
+    """Return the (orbits, 24, 2) flattened facelets of each wing edge, grouped
+    by orbit and ordered so that moves never swap the two facelets."""
+    middle = (size - 1) / 2
+    orbits: dict[float, list[list[int]]] = {}
+    ys, zs, xs = (
+        coordinates.flatten() for coordinates in get_facelet_coordinates(size)
+    )
+
+    for coordinate, facelets in _get_edges(size):
+        if coordinate == middle:
+            continue
+
+        first, second = facelets
+        position = np.array([xs[first], ys[first], zs[first]]) - middle
+        direction = np.where(np.abs(position) < middle, position, 0)
+        normals = NORMALS[[_get_face(first, size), _get_face(second, size)]]
+        if np.dot(np.cross(*normals), direction) < 0:
+            first, second = second, first
+        orbits.setdefault(abs(coordinate - middle), []).append([first, second])
+
+    return np.array([orbits[key] for key in sorted(orbits)], dtype=int).reshape(
+        -1, 24, 2
+    )
+
+
+@lru_cache(maxsize=None)
+def get_center_facelets(size: int) -> np.ndarray:
+    """Return the flattened facelet at the center of each face of an odd
+    cube."""
+    if size % 2 == 0:
+        return np.empty(0, dtype=int)
+
+    middle = size // 2
+    return np.arange(len(FACES)) * size * size + middle * size + middle
@@ -0,0 +1,114 @@
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from multiprocessing.shared_memory import SharedMemory
+from types import TracebackType
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+from .move import Move
+from .solver import get_corner_distances, set_corner_distances, solve
+
+Solution = Optional[list[Move]]
+
+# Shared memory holding the corner distances in the worker processes, kept
+# open for as long as they run
+_shared_memory: Optional[SharedMemory] = None
+
+
+class SolveFarm:
+    """Solve states in a pool of worker processes.
+
+    The corner distances bounding the searches are computed once and shared
+    read-only with all the workers through shared memory instead of being
+    copied or computed again by each of them. Use as a context manager, or
+    call `close` to stop the workers and free the shared memory.
+
+    Each search expands at most `max_nodes` states, None for no limit, as
+    closing the farm waits for the searches already running.
+    """
+
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        max_depth: int = 12,
+        max_nodes: Optional[int] = 10_000,
+    ) -> None:
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.processes = processes or os.cpu_count() or 1
+        distances = get_corner_distances()
+        self.shared_memory = SharedMemory(create=True, size=distances.nbytes)
+        np.ndarray(distances.shape, distances.dtype, self.shared_memory.buf)[:] = (
+            distances
+        )
+        self.executor = ProcessPoolExecutor(
+            self.processes,
+            initializer=_init_worker,
+            initargs=(self.shared_memory.name, distances.shape, distances.dtype.str),
+        )
+
+    def __enter__(self) -> "SolveFarm":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.executor.shutdown(cancel_futures=True)
+        self.shared_memory.close()
+        self.shared_memory.unlink()
+
+    def solve(
+        self, states: Iterable[np.ndarray], ordered: bool = True
+    ) -> Iterator[tuple[int, Solution]]:
+        """Yield the index and solution of each of the (6, size, size)
+        `states`, in the order of the states or as soon as they are solved,
+        the solution being None when the search runs out of budget.
+
+        At most two states per worker are pending at once, so that `states`
+        is only consumed as fast as they are solved.
+        """
+        indexed_states = enumerate(states)
+        pending: dict[Future[Solution], int] = {}
+        order: deque[Future[Solution]] = deque()
+
+        def submit() -> bool:
+            for index, state in indexed_states:
+                future = self.executor.submit(
+                    solve, state, self.max_depth, self.max_nodes
+                )
+                pending[future] = index
+                order.append(future)
+                return True
+            return False
+
+        while len(pending) < 2 * self.processes and submit():
+            pass
+
+        while pending:
+            if ordered:
+                done = [order.popleft()]
+                done[0].result()
+            else:
+                done = list(wait(pending, return_when=FIRST_COMPLETED).done)
+                for future in done:
+                    order.remove(future)
+
+            for future in done:
+                yield pending.pop(future), future.result()
+                submit()
+
+
+def _init_worker(name: str, shape: tuple[int, ...], dtype: str) -> None:
+    global _shared_memory
+    _shared_memory = SharedMemory(name=name)
+    distances = np.ndarray(shape, dtype, _shared_memory.buf)
+    distances.setflags(write=False)
+    set_corner_distances(distances)
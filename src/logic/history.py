@@ -0,0 +1,82 @@
+from typing import Optional
+
+import numpy as np
+
+from .move import Move
+from .rubiks_cube import RubiksCube
+
+
+class MoveHistory:
+    """Moves applied to a Rubik's cube, which can be undone and redone.
+
+    Moves are logged as packed integers and the state is saved every
+    `checkpoint_interval` moves, so that going back to any point of the
+    history costs one restore and less than `checkpoint_interval` moves.
+    """
+
+    def __init__(self, rubiks_cube: RubiksCube, checkpoint_interval: int = 32) -> None:
+        if checkpoint_interval <= 0:
+            raise ValueError("'checkpoint_interval' must be greater than 0")
+
+        self.rubiks_cube = rubiks_cube
+        self.checkpoint_interval = checkpoint_interval
+        self.position = 0
+        self.length = 0
+        self.moves = np.empty(checkpoint_interval, dtype=np.uint16)
+        self.checkpoints = rubiks_cube.allocate_snapshots(1)
+        rubiks_cube.snapshot(out=self.checkpoints[0])
+
+    def __len__(self) -> int:
+        return self.length
+
+    def get_moves(self) -> list[Move]:
+        return [Move.decode(code) for code in self.moves[: self.length]]
+
+    def rotate(self, move: Move) -> None:
+        self.rubiks_cube.rotate(move)
+
+        if self.position == len(self.moves):
+            self.moves = np.concatenate([self.moves, np.empty_like(self.moves)])
+        self.moves[self.position] = move.encode()
+        self.position += 1
+        self.length = self.position
+
+        checkpoint, offset = divmod(self.position, self.checkpoint_interval)
+        if offset == 0:
+            if checkpoint == len(self.checkpoints):
+                self.checkpoints = np.concatenate(
+                    [self.checkpoints, np.empty_like(self.checkpoints)]
+                )
+            self.rubiks_cube.snapshot(out=self.checkpoints[checkpoint])
+
+    def undo(self) -> Optional[Move]:
+        if self.position == 0:
+            return None
+
+        self.position -= 1
+        move = Move.decode(self.moves[self.position])
+        self.rubiks_cube.rotate(move, inverse=True)
+        return move
+
+    def redo(self) -> Optional[Move]:
+        if self.position == self.length:
+            return None
+
+        move = Move.decode(self.moves[self.position])
+        self.rubiks_cube.rotate(move)
+        self.position += 1
+        return move
+
+    def seek(self, position: int) -> None:
+        if not 0 <= position <= self.length:
+            raise ValueError(f"'position' must be between 0 and {self.length}")
+
+        start = position - position % self.checkpoint_interval
+        if not start <= self.position <= position:
+            self.rubiks_cube.restore(
+                self.checkpoints[start // self.checkpoint_interval]
+            )
+            self.position = start
+
+        while self.position < position:
+            self.redo()
@@ -0,0 +1,160 @@
+import functools
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+import numpy as np
+
+from .rubiks_cube import RubiksCube
+
+PERCENTILES = (50, 90, 99)
+
+
+class OperationStats:
+    """Call count, timings and allocated memory blocks of an operation, the
+    percentiles being computed over its last `samples` calls."""
+
+    def __init__(self, samples: int = 1024) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.allocated_blocks = 0
+        self.durations: deque[float] = deque(maxlen=samples)
+
+    def add(self, duration: float, allocated_blocks: int) -> None:
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.allocated_blocks += allocated_blocks
+        self.durations.append(duration)
+
+    def get_percentiles(self) -> dict[int, float]:
+        if not self.durations:
+            return {percentile: 0.0 for percentile in PERCENTILES}
+        values = np.percentile(np.fromiter(self.durations, float), PERCENTILES)
+        return dict(zip(PERCENTILES, values.tolist()))
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "total_ms": 1000 * self.total,
+            "mean_ms": 1000 * self.total / self.count if self.count else 0.0,
+            **{
+                f"p{percentile}_ms": 1000 * value
+                for percentile, value in self.get_percentiles().items()
+            },
+            "max_ms": 1000 * self.max,
+            "allocated_blocks": self.allocated_blocks,
+        }
+
+
+class Instrumentation:
+    """Timings of the hot paths of classes, listed by their `HOT_PATHS`.
+
+    The methods are only wrapped while the instrumentation is enabled, so it
+    costs nothing otherwise. Calls made through methods bound before enabling
+    it, such as timer callbacks, aren't recorded. Nested calls are recorded by
+    each operation, so the time of `rotate` includes the one of `rotate_row`.
+
+    Allocated blocks are the memory blocks held by the interpreter after a call
+    minus the ones before it, which leaves out the temporary ones.
+    """
+
+    def __init__(self, *classes: type, samples: int = 1024) -> None:
+        self.classes = classes or (RubiksCube,)
+        self.samples = samples
+        self.operations: dict[str, OperationStats] = {}
+        self._originals: dict[tuple[type, str], Any] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._originals)
+
+    def enable(self) -> None:
+        if self.enabled:
+            return
+        for cls in self.classes:
+            for name in getattr(cls, "HOT_PATHS"):
+                method = cls.__dict__[name]
+                if getattr(method, "__instrumented__", False):
+                    self.disable()
+                    raise RuntimeError(f"{cls.__name__}.{name} is already instrumented")
+                self._originals[cls, name] = method
+                setattr(cls, name, self._wrap(f"{cls.__name__}.{name}", method))
+
+    def disable(self) -> None:
+        for (cls, name), method in self._originals.items():
+            setattr(cls, name, method)
+        self._originals.clear()
+
+    def reset(self) -> None:
+        self.operations = {
+            name: OperationStats(self.samples) for name in self.operations
+        }
+
+    def to_dict(self) -> dict[str, dict[str, float]]:
+        return {name: stats.to_dict() for name, stats in self.operations.items()}
+
+    def to_prometheus(self, prefix: str = "rubiks_cube") -> str:
+        """Return the statistics in the Prometheus text exposition format."""
+        metric = f"{prefix}_operation"
+        lines = [
+            f"# HELP {metric}_seconds Duration of the calls of each operation.",
+            f"# TYPE {metric}_seconds summary",
+        ]
+        for name, stats in self.operations.items():
+            labels = f'operation="{name}"'
+            for percentile, value in stats.get_percentiles().items():
+                quantile = percentile / 100
+                lines.append(
+                    f'{metric}_seconds{{{labels},quantile="{quantile}"}} {value}'
+                )
+            lines.append(f"{metric}_seconds_sum{{{labels}}} {stats.total}")
+            lines.append(f"{metric}_seconds_count{{{labels}}} {stats.count}")
+
+        lines += [
+            f"# HELP {metric}_allocated_blocks Memory blocks kept by the calls of "
+            "each operation.",
+            f"# TYPE {metric}_allocated_blocks gauge",
+        ]
+        for name, stats in self.operations.items():
+            lines.append(
+                f'{metric}_allocated_blocks{{operation="{name}"}} '
+                f"{stats.allocated_blocks}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def __enter__(self) -> "Instrumentation":
+        self.enable()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.disable()
+
+    def _wrap(self, name: str, method: Callable[..., Any]) -> Callable[..., Any]:
+        self.operations.setdefault(name, OperationStats(self.samples))
+
+        @functools.wraps(method)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            blocks = sys.getallocatedblocks()
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                duration = time.perf_counter() - start
+                allocated_blocks = sys.getallocatedblocks() - blocks
+                self.operations[name].add(duration, allocated_blocks)
+
+        wrapper.__instrumented__ = True  # type: ignore
+        return wrapper
+
+
+@contextmanager
+def profile(*classes: type, samples: int = 1024) -> Iterator[Instrumentation]:
+    """Record the hot paths of `classes`, `RubiksCube` by default, during the
+    block, the statistics staying available after it."""
+    instrumentation = Instrumentation(*classes, samples=samples)
+    with instrumentation:
+        yield instrumentation
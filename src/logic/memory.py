@@ -0,0 +1,133 @@
+import gc
+import tracemalloc
+from functools import lru_cache
+from typing import Callable, Iterable, Sequence
+
+from .facelets import pack_states
+from .rubiks_cube import RubiksCube
+
+# Representations of a state, from the largest to the most compact
+REPRESENTATIONS = ("cubes", "rubiks_cube", "facelets", "packed")
+# Bigger sizes are extrapolated from this one, as building them to measure
+# them could take the memory the budget is meant to protect
+MAX_MEASURED_SIZE = 10
+
+
+def _build_cubes(size: int, count: int) -> object:
+    rubiks_cubes = [RubiksCube(size) for _ in range(count)]
+    for rubiks_cube in rubiks_cubes:
+        rubiks_cube.cubes  # builds them
+    return rubiks_cubes
+
+
+def _build_rubiks_cubes(size: int, count: int) -> object:
+    return [RubiksCube(size) for _ in range(count)]
+
+
+def _build_facelets(size: int, count: int) -> object:
+    return RubiksCube(size).allocate_snapshots(count)
+
+
+def _build_packed(size: int, count: int) -> object:
+    return pack_states(RubiksCube(size).allocate_snapshots(count))
+
+
+BUILDERS: dict[str, Callable[[int, int], object]] = {
+    "cubes": _build_cubes,
+    "rubiks_cube": _build_rubiks_cubes,
+    "facelets": _build_facelets,
+    "packed": _build_packed,
+}
+
+
+def measure_state_bytes(size: int, representation: str, count: int = 64) -> float:
+    """Return the bytes taken by a state of a cube of `size` in
+    `representation`, measured with tracemalloc over `count` states."""
+    if representation not in BUILDERS:
+        raise ValueError(f"'representation' must be one of {REPRESENTATIONS}")
+    build = BUILDERS[representation]
+    # Tables cached along the way don't belong to the states
+    build(size, 1)
+
+    is_tracing = tracemalloc.is_tracing()
+    if not is_tracing:
+        tracemalloc.start()
+    try:
+        gc.collect()
+        before, _ = tracemalloc.get_traced_memory()
+        states = build(size, count)
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        if not is_tracing:
+            tracemalloc.stop()
+    del states
+    return (after - before) / count
+
+
+@lru_cache(maxsize=None)
+def get_state_bytes(size: int, representation: str) -> float:
+    """Return the bytes taken by a state of a cube of `size` in
+    `representation`, measured once per size up to `MAX_MEASURED_SIZE`.
+
+    Bigger sizes are extrapolated from `MAX_MEASURED_SIZE`, in proportion to
+    the number of cubes for the cubes, and to the number of facelets
+    otherwise, which overestimates them slightly.
+    """
+    if size <= MAX_MEASURED_SIZE:
+        return measure_state_bytes(size, representation)
+    exponent = 3 if representation == "cubes" else 2
+    measured = get_state_bytes(MAX_MEASURED_SIZE, representation)
+    return measured * (size / MAX_MEASURED_SIZE) ** exponent
+
+
+def get_memory_report(
+    sizes: Iterable[int], representations: Sequence[str] = REPRESENTATIONS
+) -> dict[str, dict[int, float]]:
+    """Return the bytes per state of each representation and size."""
+    sizes = list(sizes)
+    return {
+        representation: {size: get_state_bytes(size, representation) for size in sizes}
+        for representation in representations
+    }
+
+
+class MemoryBudget:
+    """Limit of the bytes that states of cubes can take, in a worker for
+    instance."""
+
+    def __init__(self, limit: int) -> None:
+        if limit <= 0:
+            raise ValueError("'limit' must be greater than 0")
+        self.limit = limit
+
+    def get_bytes(self, size: int, count: int, representation: str) -> float:
+        return count * get_state_bytes(size, representation)
+
+    def fits(self, size: int, count: int, representation: str) -> bool:
+        return self.get_bytes(size, count, representation) <= self.limit
+
+    def check(self, size: int, count: int, representation: str) -> None:
+        """Raise MemoryError if `count` states of cubes of `size` in
+        `representation` exceed the limit."""
+        if not self.fits(size, count, representation):
+            raise MemoryError(self._get_error(size, count, representation))
+
+    def choose(self, size: int, count: int, representation: str) -> str:
+        """Return `representation` if `count` states of cubes of `size` fit in
+        the limit with it, the largest more compact one that fits otherwise.
+
+        Raise MemoryError if even the most compact one doesn't fit.
+        """
+        if representation not in REPRESENTATIONS:
+            raise ValueError(f"'representation' must be one of {REPRESENTATIONS}")
+        for compact in REPRESENTATIONS[REPRESENTATIONS.index(representation) :]:
+            if self.fits(size, count, compact):
+                return compact
+        raise MemoryError(self._get_error(size, count, REPRESENTATIONS[-1]))
+
+    def _get_error(self, size: int, count: int, representation: str) -> str:
+        needed = self.get_bytes(size, count, representation)
+        return (
+            f"{count} states of size {size} as {representation} take "
+            f"{needed:,.0f} bytes, over the limit of {self.limit:,}"
+        )
@@ -0,0 +1,44 @@
+import random
+from typing import Iterable, Iterator, NamedTuple
+
+from .enums import Axis
+
+AXES = list(Axis)
+AXIS_LETTERS = {Axis.SLICE: "S", Axis.ROW: "R", Axis.COLUMN: "C"}
+
+
+class Move(NamedTuple):
+    axis: Axis
+    number: int
+
+    def __str__(self) -> str:
+        return f"{AXIS_LETTERS[self.axis]}{self.number}"
+
+    def encode(self) -> int:
+        return self.number * len(AXES) + AXES.index(self.axis)
+
+    @classmethod
+    def decode(cls, code: int) -> "Move":
+        number, axis_index = divmod(int(code), len(AXES))
+        return cls(AXES[axis_index], number)
+
+    @classmethod
+    def parse(cls, text: str) -> "Move":
+        for axis, letter in AXIS_LETTERS.items():
+            if text[:1].upper() == letter and text[1:].isdigit():
+                return cls(axis, int(text[1:]))
+        raise ValueError(f"'{text}' is not a valid move")
+
+
+def parse_moves(text: str) -> list[Move]:
+    return [Move.parse(token) for token in text.split()]
+
+
+def format_moves(moves: Iterable[Move]) -> str:
+    return " ".join(str(move) for move in moves)
+
+
+def get_random_moves(size: int, count: int) -> Iterator[Move]:
+    for _ in range(count):
+        number = random.randint(0, size - 1)
+        yield Move(AXES[random.randint(0, len(AXES) - 1)], number)
@@ -0,0 +1,67 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator
+
+from .rubiks_cube import RubiksCube
+
+
+class RubiksCubePool:
+    """Idle Rubik's cubes kept by size to be handed out again instead of
+    creating new ones.
+
+    At most `max_per_size` idle cubes are kept per size, and the idle cubes of
+    the least recently used size are dropped once more than `max_sizes` sizes
+    have some.
+    """
+
+    def __init__(self, max_per_size: int = 16, max_sizes: int = 8) -> None:
+        if max_per_size < 0:
+            raise ValueError("'max_per_size' must be positive")
+        if max_sizes < 0:
+            raise ValueError("'max_sizes' must be positive")
+
+        self.max_per_size = max_per_size
+        self.max_sizes = max_sizes
+        self.idle: OrderedDict[int, list[RubiksCube]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return sum(len(rubiks_cubes) for rubiks_cubes in self.idle.values())
+
+    def acquire(self, size: int) -> RubiksCube:
+        """Return a solved Rubik's cube of `size`."""
+        rubiks_cubes = self.idle.get(size)
+        if not rubiks_cubes:
+            return RubiksCube(size)
+
+        rubiks_cube = rubiks_cubes.pop()
+        if rubiks_cubes:
+            self.idle.move_to_end(size)
+        else:
+            del self.idle[size]
+        return rubiks_cube
+
+    def release(self, rubiks_cube: RubiksCube) -> None:
+        """Reset `rubiks_cube` and keep it to be acquired again."""
+        rubiks_cubes = self.idle.get(rubiks_cube.size, [])
+        if (
+            not self.max_sizes
+            or len(rubiks_cubes) >= self.max_per_size
+            or any(idle is rubiks_cube for idle in rubiks_cubes)
+        ):
+            return
+
+        rubiks_cube.reset()
+        rubiks_cubes.append(rubiks_cube)
+        self.idle[rubiks_cube.size] = rubiks_cubes
+        self.idle.move_to_end(rubiks_cube.size)
+        while len(self.idle) > self.max_sizes:
+            self.idle.popitem(last=False)
+
+    @contextmanager
+    def rubiks_cube(self, size: int) -> Iterator[RubiksCube]:
+        """Acquire a Rubik's cube of `size`, released on exit."""
+        rubiks_cube = self.acquire(size)
+        try:
+            yield rubiks_cube
+        finally:
+            self.release(rubiks_cube)
@@ -0,0 +1,87 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from .facelets import (
+    COLORS,
+    FACES,
+    get_cube_facelets,
+    get_facelet_coordinates,
+    get_solved_faces,
+)
+
+
+class Progress(NamedTuple):
+    matching_stickers: np.ndarray
+    solved_faces: np.ndarray
+    solved_cubes: np.ndarray
+    solved_first_layer: np.ndarray
+    solved_first_two_layers: np.ndarray
+
+
+def get_reference_colors(states: np.ndarray) -> np.ndarray:
+    """Return the color each face of the (..., 6, size, size) `states` is
+    solved with: the one of its center for odd sizes, its most common one for
+    even sizes, which have no center."""
+    size = states.shape[-1]
+    if size % 2:
+        reference_colors: np.ndarray = states[..., size // 2, size // 2]
+        return reference_colors
+
+    faces = states.reshape(*states.shape[:-2], size * size)
+    counts = (faces[..., np.newaxis] == np.arange(len(COLORS), dtype=np.uint8)).sum(
+        axis=-2
+    )
+    reference_colors = counts.argmax(axis=-1).astype(states.dtype)
+    return reference_colors
+
+
+def get_matching_stickers(states: np.ndarray) -> np.ndarray:
+    """Return, for each facelet of the (..., 6, size, size) `states`, whether
+    it has the reference color of its face."""
+    reference_colors = get_reference_colors(states)
+    matching: np.ndarray = states == reference_colors[..., np.newaxis, np.newaxis]
+    return matching
+
+
+def count_matching_stickers(states: np.ndarray) -> np.ndarray:
+    """Return the number of facelets of the (..., 6, size, size) `states`
+    with the reference color of their face."""
+    counts: np.ndarray = get_matching_stickers(states).sum(axis=(-3, -2, -1))
+    return counts
+
+
+def count_solved_faces(states: np.ndarray) -> np.ndarray:
+    """Return the number of faces of a single color of the (..., 6, size,
+    size) `states`."""
+    solved_faces = get_solved_faces(states.reshape(-1, *states.shape[-3:]))
+    counts: np.ndarray = solved_faces.sum(axis=1).reshape(states.shape[:-3])
+    return counts
+
+
+def get_progress(states: np.ndarray) -> Progress:
+    """Return the progress metrics of the (..., 6, size, size) `states`.
+
+    A cube is solved when all its facelets have the reference color of their
+    face, and the first layers are the ones of the bottom face, which are
+    meant for 3x3x3 cubes but defined for any size.
+    """
+    size = states.shape[-1]
+    matching = get_matching_stickers(states)
+    flat_matching = matching.reshape(*states.shape[:-3], len(FACES) * size * size)
+    # Facelets padding the cubes index the last column, always matching
+    padded_matching = np.concatenate(
+        [flat_matching, np.ones((*states.shape[:-3], 1), dtype=bool)], axis=-1
+    )
+    cube_facelets = get_cube_facelets(size)
+    solved_cubes = np.all(padded_matching[..., cube_facelets], axis=-1)
+
+    _, zs, _ = get_facelet_coordinates(size)
+    layers = zs.flat[cube_facelets[:, 0]]
+    return Progress(
+        np.sum(matching, axis=(-3, -2, -1)),
+        count_solved_faces(states),
+        np.sum(solved_cubes, axis=-1),
+        np.all(solved_cubes[..., layers == 0], axis=-1),
+        np.all(solved_cubes[..., layers <= 1], axis=-1),
+    )
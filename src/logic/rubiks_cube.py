@@ -1,133 +1,145 @@
-# ruff: noqa: E731
-
 import copy
-import random
-from typing import Iterator
+from typing import ClassVar, Iterator, Optional
 
 import numpy as np
 
 from .cube import Cube
-from .enums import Color, Face
-from .utils import are_all_values_equal
+from .enums import Axis, Color
+from .facelets import (
+    FACES,
+    are_solved,
+    get_facelet_coordinates,
+    get_moved_facelets,
+    get_solved_facelets,
+)
+from .move import Move, get_random_moves
+from .validation import validate_states
 
 
 class RubiksCube:
+    # Methods timed by the instrumentation
+    HOT_PATHS: ClassVar[tuple[str, ...]] = (
+        "is_finished",
+        "is_valid",
+        "set_facelets",
+        "reset",
+        "rotate",
+        "rotate_slice",
+        "rotate_row",
+        "rotate_column",
+    )
+
     def __init__(self, size: int) -> None:
         if size <= 0:
             raise ValueError("'size' must be greater than 0")
         self.size = size
-        self.cubes = np.full((size, size, size), None)
-        self.reset()
+        # The facelets hold the state, the cubes are only built when needed
+        self.facelets = get_solved_facelets(size).copy()
+        self._cubes: Optional[np.ndarray] = None
+        self._are_cubes_current = False
+
+    @property
+    def cubes(self) -> np.ndarray:
+        """Read-only view of the cubes, derived from the facelets the first
+        time it's read after the Rubik's cube changes. Changing the cubes
+        doesn't change the Rubik's cube, and is undone once it changes. The
+        same Cube objects are kept from one change to the next."""
+        if self._cubes is None:
+            self._cubes = np.full((self.size, self.size, self.size), None)
+            for index in np.ndindex(self._cubes.shape):
+                self._cubes[index] = Cube({})
+            self._are_cubes_current = False
+
+        if not self._are_cubes_current:
+            colors = self._get_cube_colors().reshape(-1, len(FACES))
+            for cube, facecolors in zip(self._cubes.flat, colors):
+                cube.facecolors = dict(zip(FACES, facecolors))
+            self._are_cubes_current = True
+        return self._cubes
 
     def is_finished(self) -> bool:
-        is_finished = True
-
-        front_cubes = self.cubes[0, :, :].flatten()
-        get_front_colors = lambda cube: cube.facecolors[Face.FRONT]
-        front_colors = np.frompyfunc(get_front_colors, 1, 1)(front_cubes)
-
-        is_finished &= are_all_values_equal(front_colors)
-
-        right_cubes = self.cubes[:, :, self.size - 1].flatten()
-        get_right_colors = lambda cube: cube.facecolors[Face.RIGHT]
-        right_colors = np.frompyfunc(get_right_colors, 1, 1)(right_cubes)
-
-        is_finished &= are_all_values_equal(right_colors)
+        return bool(are_solved(self.facelets[np.newaxis])[0])
 
-        back_cubes = self.cubes[self.size - 1, :, :].flatten()
-        get_back_colors = lambda cube: cube.facecolors[Face.BACK]
-        back_colors = np.frompyfunc(get_back_colors, 1, 1)(back_cubes)
+    def is_valid(self) -> bool:
+        return bool(validate_states(self.facelets[np.newaxis])[0])
 
-        is_finished &= are_all_values_equal(back_colors)
+    def get_facelets(self) -> np.ndarray:
+        return self.facelets.copy()
 
-        left_cubes = self.cubes[:, :, 0].flatten()
-        get_left_colors = lambda cube: cube.facecolors[Face.LEFT]
-        left_colors = np.frompyfunc(get_left_colors, 1, 1)(left_cubes)
+    def set_facelets(self, facelets: np.ndarray) -> None:
+        if facelets.shape != self.facelets.shape:
+            raise ValueError(f"'facelets' must be of shape {self.facelets.shape}")
 
-        is_finished &= are_all_values_equal(left_colors)
+        np.copyto(self.facelets, facelets)
+        self._are_cubes_current = False
 
-        bottom_cubes = self.cubes[:, 0, :].flatten()
-        get_bottom_colors = lambda cube: cube.facecolors[Face.BOTTOM]
-        bottom_colors = np.frompyfunc(get_bottom_colors, 1, 1)(bottom_cubes)
+    def clone(self) -> "RubiksCube":
+        rubiks_cube = copy.copy(self)
+        rubiks_cube.facelets = self.facelets.copy()
+        rubiks_cube._cubes = None
+        return rubiks_cube
 
-        is_finished &= are_all_values_equal(bottom_colors)
+    def allocate_snapshots(self, count: int) -> np.ndarray:
+        return np.empty((count, *self.facelets.shape), dtype=self.facelets.dtype)
 
-        top_cubes = self.cubes[:, self.size - 1, :].flatten()
-        get_top_colors = lambda cube: cube.facecolors[Face.TOP]
-        top_colors = np.frompyfunc(get_top_colors, 1, 1)(top_cubes)
+    def snapshot(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        if out is None:
+            return self.facelets.copy()
 
-        is_finished &= are_all_values_equal(top_colors)
+        np.copyto(out, self.facelets)
+        return out
 
-        return is_finished
+    def restore(self, snapshot: np.ndarray) -> None:
+        self.set_facelets(snapshot)
 
     def reset(self) -> None:
-        for y in range(self.size):  # slice
-            for z in range(self.size):  # row
-                for x in range(self.size):  # cube in a row
-                    facecolors = {
-                        Face.FRONT: Color.BLACK,
-                        Face.RIGHT: Color.BLACK,
-                        Face.BACK: Color.BLACK,
-                        Face.LEFT: Color.BLACK,
-                        Face.BOTTOM: Color.BLACK,
-                        Face.TOP: Color.BLACK,
-                    }
-
-                    if x == 0:
-                        facecolors[Face.LEFT] = Color.BLUE
-                    if x == self.size - 1:
-                        facecolors[Face.RIGHT] = Color.GREEN
-                    if z == 0:
-                        facecolors[Face.BOTTOM] = Color.WHITE
-                    if z == self.size - 1:
-                        facecolors[Face.TOP] = Color.YELLOW
-                    if y == 0:
-                        facecolors[Face.FRONT] = Color.ORANGE
-                    if y == self.size - 1:
-                        facecolors[Face.BACK] = Color.RED
-
-                    self.cubes[y, z, x] = Cube(facecolors)
+        self.set_facelets(get_solved_facelets(self.size))
 
     def shuffle(
         self, number_of_rotations: int
     ) -> Iterator[tuple[bool, bool, bool, int]]:
-        for _ in range(number_of_rotations):
-            number = random.randint(0, self.size - 1)
-            slice_or_row_or_column = random.randint(0, 2)
-
-            rotate_slice = slice_or_row_or_column == 0
-            rotate_row = slice_or_row_or_column == 1
-            rotate_column = slice_or_row_or_column == 2
-
-            if rotate_slice:
-                self.rotate_slice(number)
-            elif rotate_row:
-                self.rotate_row(number)
-            elif rotate_column:
-                self.rotate_column(number)
-
-            yield rotate_slice, rotate_row, rotate_column, number
+        for move in get_random_moves(self.size, number_of_rotations):
+            self.rotate(move)
+            yield (
+                move.axis is Axis.SLICE,
+                move.axis is Axis.ROW,
+                move.axis is Axis.COLUMN,
+                move.number,
+            )
+
+    def rotate(self, move: Move, inverse: bool = False) -> None:
+        if inverse:
+            self._rotate_facelets(move, inverse=True)
+            return
+
+        rotate = {
+            Axis.SLICE: self.rotate_slice,
+            Axis.ROW: self.rotate_row,
+            Axis.COLUMN: self.rotate_column,
+        }[move.axis]
+        rotate(move.number)
 
     def rotate_slice(self, number: int) -> None:
-        cubes_copy = copy.copy(self.cubes[number, :, :])
-
-        for z in range(self.size):
-            for x in range(self.size):
-                self.cubes[number, z, x] = cubes_copy[self.size - 1 - x, z]
-                self.cubes[number, z, x].rotate_xz()
+        self._rotate_facelets(Move(Axis.SLICE, number))
 
     def rotate_row(self, number: int) -> None:
-        cubes_copy = copy.copy(self.cubes[:, number, :])
-
-        for y in range(self.size):
-            for x in range(self.size):
-                self.cubes[y, number, x] = cubes_copy[x, self.size - 1 - y]
-                self.cubes[y, number, x].rotate_xy()
+        self._rotate_facelets(Move(Axis.ROW, number))
 
     def rotate_column(self, number: int) -> None:
-        cubes_copy = copy.copy(self.cubes[:, :, number])
-
-        for y in range(self.size):
-            for z in range(self.size):
-                self.cubes[y, z, number] = cubes_copy[self.size - 1 - z, y]
-                self.cubes[y, z, number].rotate_yz()
+        self._rotate_facelets(Move(Axis.COLUMN, number))
+
+    def _rotate_facelets(self, move: Move, inverse: bool = False) -> None:
+        targets, sources = get_moved_facelets(self.size, move)
+        if inverse:
+            targets, sources = sources, targets
+        facelets = self.facelets.reshape(-1)
+        facelets[targets] = facelets[sources]
+        self._are_cubes_current = False
+
+    def _get_cube_colors(self) -> np.ndarray:
+        # Colors of the faces of each cube, black for the inner faces
+        ys, zs, xs = get_facelet_coordinates(self.size)
+        faces = np.indices(ys.shape)[0]
+        colors = np.full((self.size, self.size, self.size, len(FACES)), Color.BLACK)
+        colors[ys, zs, xs, faces] = np.array(list(Color), dtype=object)[self.facelets]
+        return colors
@@ -0,0 +1,288 @@
+import itertools
+import math
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from .enums import Axis
+from .facelets import (
+    are_solved,
+    get_corner_facelets,
+    get_facelet_coordinates,
+    get_move_permutation,
+    get_solved_facelets,
+)
+from .move import Move
+from .validation import (
+    get_corner_lookup,
+    get_opposite_colors,
+    get_piece_keys,
+    validate_states,
+)
+
+# Corner pattern database over the 7! * 3^6 states of the corners, the corner
+# at the origin being kept in place by only turning the opposite layers
+TWIST_STATES = 3**6
+CORNER_STATES = math.factorial(7) * TWIST_STATES
+UNKNOWN_DISTANCE = 255
+
+_corner_distances: Optional[np.ndarray] = None
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+class Turn(NamedTuple):
+    move: Move
+    inverse: bool
+
+
+@lru_cache(maxsize=None)
+def _get_fixed_corner() -> tuple[int, list[int]]:
+    # Slot of the corner at the origin, and the other slots in order
+    ys, zs, xs = (coordinates.flatten() for coordinates in get_facelet_coordinates(2))
+    corners = get_corner_facelets(2)
+    (fixed,) = [
+        slot
+        for slot, facelets in enumerate(corners)
+        if not (ys[facelets].any() or zs[facelets].any() or xs[facelets].any())
+    ]
+    return fixed, [slot for slot in range(len(corners)) if slot != fixed]
+
+
+@lru_cache(maxsize=None)
+def _get_corner_moves() -> tuple[np.ndarray, np.ndarray]:
+    # Source slot and twist added to each slot by the turns of the corners
+    # database, `corners[slot] = corners[sources[slot]] + twists[slot]`
+    corners = get_corner_facelets(2)
+    slots = np.zeros(corners.size, dtype=np.int64)
+    positions = np.zeros(corners.size, dtype=np.int64)
+    slots[corners], positions[corners] = np.indices(corners.shape)
+
+    all_sources, all_twists = [], []
+    for turn in _get_turns([1]):
+        moved = _get_turn_permutation(2, turn)[corners[:, 0]]
+        all_sources.append(slots[moved])
+        all_twists.append(-positions[moved] % 3)
+    return np.array(all_sources), np.array(all_twists)
+
+
+def _get_permutation_ranks(permutations: np.ndarray) -> np.ndarray:
+    # Lexicographic rank of each permutation of `range(length)`
+    length = permutations.shape[-1]
+    smaller_after = np.triu(permutations[:, None, :] < permutations[:, :, None], 1).sum(
+        axis=2
+    )
+    factorials = [math.factorial(length - 1 - index) for index in range(length)]
+    ranks: np.ndarray = smaller_after @ np.array(factorials)
+    return ranks
+
+
+@lru_cache(maxsize=None)
+def _get_corner_tables() -> tuple[np.ndarray, np.ndarray]:
+    # Coordinates reached from each permutation and twist coordinate by each
+    # turn of the corners database
+    fixed, others = _get_fixed_corner()
+    sources, twists = _get_corner_moves()
+
+    pieces = np.zeros((math.factorial(7), 8), dtype=np.int64)
+    pieces[:, fixed] = fixed
+    pieces[:, others] = np.array(others)[
+        np.array(list(itertools.permutations(range(7))))
+    ]
+    slot_twists = np.zeros((TWIST_STATES, 8), dtype=np.int64)
+    digits = np.array(list(itertools.product(range(3), repeat=6)))
+    slot_twists[:, others[:-1]] = digits
+    slot_twists[:, others[-1]] = -digits.sum(axis=1) % 3
+
+    permutation_table = np.stack(
+        [_get_piece_coordinates(pieces[:, slot_sources]) for slot_sources in sources],
+        axis=1,
+    )
+    twist_table = np.stack(
+        [
+            _get_twist_coordinates((slot_twists[:, slot_sources] + slot_moves) % 3)
+            for slot_sources, slot_moves in zip(sources, twists)
+        ],
+        axis=1,
+    )
+    return permutation_table, twist_table
+
+
+def _get_piece_coordinates(pieces: np.ndarray) -> np.ndarray:
+    _, others = _get_fixed_corner()
+    indices = np.zeros(8, dtype=np.int64)
+    indices[others] = np.arange(7)
+    return _get_permutation_ranks(indices[pieces[:, others]])
+
+
+def _get_twist_coordinates(twists: np.ndarray) -> np.ndarray:
+    _, others = _get_fixed_corner()
+    coordinates: np.ndarray = twists[:, others[:-1]] @ 3 ** np.arange(5, -1, -1)
+    return coordinates
+
+
+def get_corner_distances() -> np.ndarray:
+    """Return the number of quarter turns needed to solve the corners of each
+    corner state, whatever the orientation of the solved cube.
+
+    The distances are found by a breadth-first search over all the states at
+    once, one array operation per turn and depth, unless they were given by
+    `set_corner_distances`.
+    """
+    global _corner_distances
+    if _corner_distances is None:
+        _corner_distances = _search_corner_distances()
+    return _corner_distances
+
+
+def set_corner_distances(distances: np.ndarray) -> None:
+    """Use the corner `distances` computed elsewhere, such as by another
+    process sharing them."""
+    global _corner_distances
+    if distances.shape != (CORNER_STATES,):
+        raise ValueError(f"'distances' must be of shape {(CORNER_STATES,)}")
+    _corner_distances = distances
+
+
+def _search_corner_distances() -> np.ndarray:
+    permutation_table, twist_table = _get_corner_tables()
+    distances = np.full(CORNER_STATES, UNKNOWN_DISTANCE, dtype=np.uint8)
+    distances[0] = 0
+    frontier = np.zeros(1, dtype=np.int64)
+
+    depth = 0
+    while frontier.size:
+        permutations, twists = np.divmod(frontier, TWIST_STATES)
+        reached = (
+            permutation_table[permutations] * TWIST_STATES + twist_table[twists]
+        ).ravel()
+        depth += 1
+        distances[reached[distances[reached] == UNKNOWN_DISTANCE]] = depth
+        frontier = np.flatnonzero(distances == depth)
+
+    distances.setflags(write=False)
+    return distances
+
+
+def get_corner_states(size: int, states: np.ndarray) -> np.ndarray:
+    """Return the corner state of each of the (count, 6 * size * size)
+    flattened `states`, colors being relabeled so that the corner at the
+    origin is solved."""
+    corner_colors = states[:, get_corner_facelets(size)].astype(np.int64)
+    solved = get_solved_facelets(2).flatten()[get_corner_facelets(2)]
+    fixed, _ = _get_fixed_corner()
+
+    opposite_colors = get_opposite_colors()
+    relabels = np.zeros((len(states), len(opposite_colors)), dtype=np.int64)
+    rows = np.arange(len(states))[:, None]
+    fixed_colors = corner_colors[:, fixed]
+    relabels[rows, fixed_colors] = solved[fixed]
+    relabels[rows, opposite_colors[fixed_colors]] = opposite_colors[solved[fixed]]
+    corner_colors = np.take_along_axis(
+        relabels, corner_colors.reshape(len(states), -1), 1
+    )
+
+    corners = get_corner_lookup(2)[get_piece_keys(corner_colors.reshape(-1, 8, 3))]
+    pieces, twists = np.divmod(corners, 3)
+    corner_states: np.ndarray = _get_piece_coordinates(
+        pieces
+    ) * TWIST_STATES + _get_twist_coordinates(twists)
+    return corner_states
+
+
+def _get_turns(numbers: list[int]) -> list[Turn]:
+    return [
+        Turn(Move(axis, number), inverse)
+        for axis in Axis
+        for number in numbers
+        for inverse in (False, True)
+    ]
+
+
+def _get_turn_permutation(size: int, turn: Turn) -> np.ndarray:
+    permutation = get_move_permutation(size, turn.move)
+    if turn.inverse:
+        return np.argsort(permutation)
+    return permutation
+
+
+def _is_redundant(turn: Turn, path: list[Turn]) -> bool:
+    # Turns of the same axis commute, so they are only tried in increasing
+    # layer order, and a layer is never turned back nor three times in a row
+    if not path:
+        return False
+    previous = path[-1]
+    if turn.move.axis is not previous.move.axis:
+        return False
+    if turn.move.number != previous.move.number:
+        return turn.move.number < previous.move.number
+    return turn.inverse != previous.inverse or (
+        turn.inverse or len(path) >= 2 and path[-2] == turn
+    )
+
+
+def solve(
+    facelets: np.ndarray, max_depth: int = 12, max_nodes: Optional[int] = None
+) -> Optional[list[Move]]:
+    """Return moves solving the (6, size, size) `facelets` in as few quarter
+    turns as possible, or None if it takes more than `max_depth` of them, if
+    the search expands more than `max_nodes` states, or if the state can't be
+    solved.
+
+    This is an iterative deepening A* search, bounded by the number of turns
+    needed to solve the corners. Turning a layer backwards is written as three
+    moves, so solutions can hold more moves than quarter turns.
+    """
+    size = facelets.shape[-1]
+    if not validate_states(facelets[np.newaxis])[0]:
+        return None
+
+    # Turning the first layers of a 2x2x2 cube only changes its orientation
+    turns = _get_turns([1] if size == 2 else list(range(size)))
+    permutations = np.stack([_get_turn_permutation(size, turn) for turn in turns])
+
+    def get_distances(states: np.ndarray) -> np.ndarray:
+        if size < 2:
+            return np.zeros(len(states), dtype=np.int64)
+        distances: np.ndarray = get_corner_distances()[get_corner_states(size, states)]
+        return distances.astype(np.int64)
+
+    nodes = 0
+
+    def search(state: np.ndarray, path: list[Turn], bound: int) -> bool:
+        nonlocal nodes
+        nodes += 1
+        if max_nodes is not None and nodes > max_nodes:
+            raise _BudgetExceeded
+        children = state[permutations]
+        finished = are_solved(children)
+        distances = get_distances(children)
+        for index in np.argsort(distances, kind="stable"):
+            turn = turns[index]
+            if len(path) + 1 + distances[index] > bound or _is_redundant(turn, path):
+                continue
+            path.append(turn)
+            if finished[index] or (
+                len(path) < bound and search(children[index], path, bound)
+            ):
+                return True
+            path.pop()
+        return False
+
+    state = facelets.reshape(-1)
+    if are_solved(state[np.newaxis])[0]:
+        return []
+
+    path: list[Turn] = []
+    try:
+        for bound in range(int(get_distances(state[np.newaxis])[0]), max_depth + 1):
+            if bound and search(state, path, bound):
+                return [
+                    turn.move for turn in path for _ in range(3 if turn.inverse else 1)
+                ]
+    except _BudgetExceeded:
+        pass
+    return None
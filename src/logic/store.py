@@ -0,0 +1,266 @@
+import json
+import os
+import tempfile
+from typing import BinaryIO, Iterable, Iterator, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+from .facelets import BITS_PER_FACELET, FACES, pack_states
+from .move import Move
+
+# Padding of the solutions shorter than the longest one a store can hold
+NO_MOVE = np.iinfo(np.uint16).max
+METADATA_FILE = "store.json"
+KEYS_FILE = "keys.bin"
+DISTANCES_FILE = "distances.bin"
+SOLUTIONS_FILE = "solutions.bin"
+
+Record = tuple[np.ndarray, int, Sequence[Move]]
+
+
+class Lookup(NamedTuple):
+    found: np.ndarray
+    distances: np.ndarray
+    solutions: np.ndarray
+
+
+class _Run(NamedTuple):
+    keys: np.ndarray
+    distances: np.ndarray
+    solutions: np.ndarray
+
+
+class StateStore:
+    """Read-only store of the distances and solutions of states of cubes of
+    one size, kept on disk in a directory.
+
+    Each state is keyed by its facelets packed into 3 bits, the keys being
+    sorted in a file mapped to memory along with the distances and solutions.
+    Only every `index_stride`-th key is held in memory, to find the block of
+    keys to search by bisection, and a batch of states is looked up with one
+    bisection step over all of them at a time.
+    """
+
+    def __init__(
+        self, path: Union[str, os.PathLike[str]], index_stride: int = 64
+    ) -> None:
+        if index_stride <= 0:
+            raise ValueError("'index_stride' must be greater than 0")
+
+        with open(os.path.join(path, METADATA_FILE)) as file:
+            metadata = json.load(file)
+        self.size: int = metadata["size"]
+        self.max_moves: int = metadata["max_moves"]
+        self.count: int = metadata["count"]
+        self.index_stride = index_stride
+
+        self.keys = _open(
+            os.path.join(path, KEYS_FILE), _get_key_dtype(self.size), (self.count,)
+        )
+        self.distances = _open(
+            os.path.join(path, DISTANCES_FILE), np.dtype(np.uint8), (self.count,)
+        )
+        self.solutions = _open(
+            os.path.join(path, SOLUTIONS_FILE),
+            np.dtype(np.uint16),
+            (self.count, self.max_moves),
+        )
+        self.index = np.array(self.keys[::index_stride])
+
+    def __len__(self) -> int:
+        return self.count
+
+    @classmethod
+    def build(
+        cls,
+        path: Union[str, os.PathLike[str]],
+        size: int,
+        records: Iterable[Record],
+        max_moves: int = 36,
+        run_size: int = 1 << 20,
+        block_size: int = 1 << 16,
+    ) -> "StateStore":
+        """Build a store in the directory `path` from (state, distance,
+        moves) records in any order and return it.
+
+        Records are sorted by runs of `run_size` written to temporary files,
+        which are then merged by blocks of `block_size` records per run, so
+        that memory doesn't grow with the number of records. The shortest
+        distance is kept for states given more than once.
+        """
+        os.makedirs(path, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=path) as directory:
+            runs = [
+                _write_run(os.path.join(directory, f"run_{index}"), run)
+                for index, run in enumerate(
+                    _get_sorted_runs(size, records, max_moves, run_size)
+                )
+            ]
+            count = _merge_runs(path, runs, block_size)
+            del runs
+
+        with open(os.path.join(path, METADATA_FILE), "w") as file:
+            json.dump({"size": size, "max_moves": max_moves, "count": count}, file)
+        return cls(path)
+
+    def lookup(self, states: np.ndarray) -> Lookup:
+        """Return whether each of the (count, 6, size, size) `states` is in the
+        store, with its distance and the codes of the moves of its solution,
+        padded with `NO_MOVE`."""
+        if states.shape[1:] != (len(FACES), self.size, self.size):
+            raise ValueError(
+                f"'states' must be of shape (count, {len(FACES)}, {self.size}, "
+                f"{self.size})"
+            )
+
+        queries = _get_keys(pack_states(states), self.size)
+        if not self.count or not len(states):
+            return Lookup(
+                np.zeros(len(states), dtype=bool),
+                np.zeros(len(states), dtype=np.uint8),
+                np.full((len(states), self.max_moves), NO_MOVE, dtype=np.uint16),
+            )
+
+        blocks = np.maximum(np.searchsorted(self.index, queries, side="right") - 1, 0)
+        lows = blocks * self.index_stride
+        highs = np.minimum(lows + self.index_stride, self.count)
+        for _ in range(self.index_stride.bit_length()):
+            searching = lows < highs
+            middles = np.where(searching, (lows + highs) // 2, 0)
+            is_before = self.keys[middles] < queries
+            lows = np.where(searching & is_before, middles + 1, lows)
+            highs = np.where(searching & ~is_before, middles, highs)
+
+        positions = np.minimum(lows, self.count - 1)
+        found = (lows < self.count) & (self.keys[positions] == queries)
+        distances = np.where(found, self.distances[positions], 0).astype(np.uint8)
+        solutions = np.where(found[:, np.newaxis], self.solutions[positions], NO_MOVE)
+        return Lookup(found, distances, solutions.astype(np.uint16))
+
+    def get(self, state: np.ndarray) -> Optional[tuple[int, list[Move]]]:
+        """Return the distance and solution of the (6, size, size) `state`, or
+        None if it isn't in the store."""
+        found, distances, solutions = self.lookup(state[np.newaxis])
+        if not found[0]:
+            return None
+        codes = solutions[0][solutions[0] != NO_MOVE]
+        return int(distances[0]), [Move.decode(code) for code in codes]
+
+
+def _get_key_dtype(size: int) -> np.dtype[np.bytes_]:
+    # Keys of the same width compare as their bytes, as the trailing zeros
+    # numpy strips from them can't tell two of them apart
+    width = -(-len(FACES) * size * size * BITS_PER_FACELET // 8)
+    return np.dtype(f"S{width}")
+
+
+def _get_keys(packed: np.ndarray, size: int) -> np.ndarray:
+    return np.ascontiguousarray(packed).view(_get_key_dtype(size)).reshape(-1)
+
+
+def _open(path: str, dtype: np.dtype[np.generic], shape: tuple[int, ...]) -> np.ndarray:
+    # Empty files can't be mapped to memory
+    if not shape[0]:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=shape)
+
+
+def _get_sorted_runs(
+    size: int, records: Iterable[Record], max_moves: int, run_size: int
+) -> Iterator[_Run]:
+    records = iter(records)
+    while True:
+        states = []
+        distances = []
+        all_codes = []
+        for _, (state, distance, moves) in zip(range(run_size), records):
+            if state.shape != (len(FACES), size, size):
+                raise ValueError(
+                    f"states must be of shape ({len(FACES)}, {size}, {size})"
+                )
+            if len(moves) > max_moves:
+                raise ValueError(f"solutions must have at most {max_moves} moves")
+            states.append(state)
+            distances.append(distance)
+            all_codes.append([move.encode() for move in moves])
+        if not states:
+            return
+
+        solutions = np.full((len(states), max_moves), NO_MOVE, dtype=np.uint16)
+        for index, codes in enumerate(all_codes):
+            solutions[index, : len(codes)] = codes
+
+        yield _sort_run(
+            _Run(
+                _get_keys(pack_states(np.stack(states)), size),
+                np.array(distances, dtype=np.uint8),
+                solutions,
+            )
+        )
+
+
+def _sort_run(run: _Run) -> _Run:
+    # Sorts by key then distance, keeping the shortest distance of each key
+    order = np.lexsort((run.distances, run.keys))
+    keys = run.keys[order]
+    is_first = np.ones(len(keys), dtype=bool)
+    is_first[1:] = keys[1:] != keys[:-1]
+    order = order[is_first]
+    return _Run(run.keys[order], run.distances[order], run.solutions[order])
+
+
+def _write_run(path: str, run: _Run) -> _Run:
+    # Writes the run to a file and maps it back to memory
+    offsets = np.cumsum([0, run.keys.nbytes, run.distances.nbytes])
+    with open(path, "wb") as file:
+        for array in run:
+            file.write(array.tobytes())
+    return _Run(
+        *(
+            np.memmap(path, array.dtype, "r", int(offset), array.shape)
+            for array, offset in zip(run, offsets)
+        )
+    )
+
+
+def _merge_runs(
+    path: Union[str, os.PathLike[str]], runs: list[_Run], block_size: int
+) -> int:
+    # Merges the sorted runs a block of each at a time. Only the keys up to the
+    # smallest last key of the blocks of the runs that have more to read are
+    # sure to come before all the keys left, so these ones are written, all the
+    # copies of a key being among them as each run holds it at most once.
+    starts = [0] * len(runs)
+    count = 0
+    with (
+        open(os.path.join(path, KEYS_FILE), "wb") as keys_file,
+        open(os.path.join(path, DISTANCES_FILE), "wb") as distances_file,
+        open(os.path.join(path, SOLUTIONS_FILE), "wb") as solutions_file,
+    ):
+        files: list[BinaryIO] = [keys_file, distances_file, solutions_file]
+        while any(start < len(run.keys) for start, run in zip(starts, runs)):
+            ends = [
+                min(start + block_size, len(run.keys))
+                for start, run in zip(starts, runs)
+            ]
+            bounds = [
+                run.keys[end - 1] for run, end in zip(runs, ends) if end < len(run.keys)
+            ]
+            bound = min(bounds) if bounds else None
+
+            blocks = []
+            for index, (run, start, end) in enumerate(zip(runs, starts, ends)):
+                if bound is not None:
+                    end = start + int(
+                        np.searchsorted(run.keys[start:end], bound, "right")
+                    )
+                blocks.append(_Run(*(array[start:end] for array in run)))
+                starts[index] = end
+
+            merged = _sort_run(
+                _Run(*(np.concatenate(arrays) for arrays in zip(*blocks)))
+            )
+            for file, array in zip(files, merged):
+                file.write(array.tobytes())
+            count += len(merged.keys)
+    return count
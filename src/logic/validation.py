@@ -0,0 +1,174 @@
+from functools import lru_cache
+
+import numpy as np
+
+from .facelets import (
+    COLORS,
+    FACES,
+    get_center_facelets,
+    get_corner_facelets,
+    get_edge_facelets,
+    get_facelet_orbits,
+    get_solved_facelets,
+    get_wing_facelets,
+)
+
+# Facelets holding anything else than a sticker color are clipped to this code
+INVALID_CODE = len(COLORS)
+OPPOSITE_FACES = [2, 3, 0, 1, 5, 4]
+
+
+def get_piece_keys(colors: np.ndarray) -> np.ndarray:
+    """Return a key for the colors along the last axis of `colors`, such as
+    the colors of the facelets of pieces, to index piece lookups with."""
+    keys = np.zeros(colors.shape[:-1], dtype=np.int64)
+    for index in range(colors.shape[-1]):
+        keys = keys * (INVALID_CODE + 1) + colors[..., index]
+    return keys
+
+
+def _get_lookup(pieces: np.ndarray, orientations: int) -> np.ndarray:
+    # Maps the key of each oriented piece to `piece * orientations + orientation`
+    lookup = np.full((INVALID_CODE + 1) ** pieces.shape[-1], -1)
+    for piece, colors in enumerate(pieces):
+        for orientation in range(orientations):
+            lookup[get_piece_keys(np.roll(colors, orientation))] = (
+                piece * orientations + orientation
+            )
+    return lookup
+
+
+@lru_cache(maxsize=None)
+def get_corner_lookup(size: int) -> np.ndarray:
+    """Return `corner * 3 + orientation` for the key of the colors of each
+    oriented corner, -1 for keys of no corner."""
+    solved = get_solved_facelets(size).flatten()
+    return _get_lookup(solved[get_corner_facelets(size)], 3)
+
+
+@lru_cache(maxsize=None)
+def _get_edge_lookup(size: int) -> np.ndarray:
+    solved = get_solved_facelets(size).flatten()
+    return _get_lookup(solved[get_edge_facelets(size)], 2)
+
+
+@lru_cache(maxsize=None)
+def _get_wing_lookup(size: int) -> np.ndarray:
+    solved = get_solved_facelets(size).flatten()
+    return _get_lookup(solved[get_wing_facelets(size)[0]], 1)
+
+
+@lru_cache(maxsize=None)
+def _get_home_faces() -> np.ndarray:
+    # Face whose solved color is each color code
+    home_faces = np.zeros(INVALID_CODE + 1, dtype=int)
+    home_faces[get_solved_facelets(1).flatten()] = np.arange(len(FACES))
+    return home_faces
+
+
+@lru_cache(maxsize=None)
+def get_opposite_colors() -> np.ndarray:
+    """Return the color code of the face opposite to the one of each color
+    code when solved, -1 for the codes of no face."""
+    solved = get_solved_facelets(1).flatten()
+    opposite_colors = np.full(INVALID_CODE + 1, -1)
+    opposite_colors[solved] = solved[OPPOSITE_FACES]
+    return opposite_colors
+
+
+def _get_parities(permutations: np.ndarray) -> np.ndarray:
+    length = permutations.shape[-1]
+    above_diagonal = np.triu(np.ones((length, length), dtype=bool), 1)
+    inversions = permutations[:, :, None] > permutations[:, None, :]
+    parities: np.ndarray = np.sum(inversions & above_diagonal, axis=(1, 2)) % 2
+    return parities
+
+
+def _are_distinct(pieces: np.ndarray) -> np.ndarray:
+    are_distinct: np.ndarray = np.all(
+        np.diff(np.sort(pieces, axis=-1), axis=-1) != 0, axis=-1
+    )
+    return are_distinct
+
+
+def _get_checks(states: np.ndarray) -> dict[str, np.ndarray]:
+    size = states.shape[-1]
+    states = states.reshape(len(states), len(FACES) * size * size)
+    checks = {"invalid colors": np.all(states < INVALID_CODE, axis=1)}
+    states = np.minimum(states, INVALID_CODE).astype(np.int64)
+
+    orbits = get_facelet_orbits(size)
+    _, orbit_indices, orbit_sizes = np.unique(
+        orbits, return_inverse=True, return_counts=True
+    )
+    keys = orbit_indices * len(COLORS) + np.minimum(states, len(COLORS) - 1)
+    keys += np.arange(len(states))[:, None] * len(orbit_sizes) * len(COLORS)
+    counts = np.bincount(
+        keys.ravel(), minlength=len(states) * len(orbit_sizes) * len(COLORS)
+    )
+    counts = counts.reshape(len(states), len(orbit_sizes), len(COLORS))
+    checks["wrong sticker counts"] = np.all(
+        counts == orbit_sizes[:, None] // len(COLORS), axis=(1, 2)
+    )
+
+    parities = np.zeros(len(states), dtype=int)
+
+    if size >= 2:
+        corners = get_corner_lookup(size)[
+            get_piece_keys(states[:, get_corner_facelets(size)])
+        ]
+        checks["invalid corners"] = np.all(corners >= 0, axis=1) & _are_distinct(
+            corners // 3
+        )
+        twists = np.where(corners >= 0, corners % 3, 0)
+        checks["twisted corner"] = np.sum(twists, axis=1) % 3 == 0
+        parities += _get_parities(corners // 3)
+
+    if size >= 3 and size % 2 == 1:
+        edges = _get_edge_lookup(size)[
+            get_piece_keys(states[:, get_edge_facelets(size)])
+        ]
+        checks["invalid edges"] = np.all(edges >= 0, axis=1) & _are_distinct(edges // 2)
+        flips = np.where(edges >= 0, edges % 2, 0)
+        checks["flipped edge"] = np.sum(flips, axis=1) % 2 == 0
+        parities += _get_parities(edges // 2)
+
+    wing_facelets = get_wing_facelets(size)
+    if len(wing_facelets):
+        wings = _get_wing_lookup(size)[get_piece_keys(states[:, wing_facelets])]
+        checks["invalid wings"] = np.all(wings >= 0, axis=(1, 2)) & np.all(
+            _are_distinct(wings), axis=1
+        )
+
+    if size % 2 == 1:
+        centers = states[:, get_center_facelets(size)]
+        corner_lookup = get_corner_lookup(2)
+        checks["invalid centers"] = np.all(
+            centers[:, OPPOSITE_FACES] == get_opposite_colors()[centers], axis=1
+        ) & (corner_lookup[get_piece_keys(centers[:, [5, 1, 0]])] >= 0)
+        parities += _get_parities(_get_home_faces()[centers])
+
+    if size >= 3 and size % 2 == 1:
+        checks["wrong permutation parity"] = parities % 2 == 0
+
+    return checks
+
+
+def validate_states(states: np.ndarray) -> np.ndarray:
+    """Return whether each of the (count, 6, size, size) `states` can be
+    reached from a solved cube.
+
+    Sticker counts, pieces, corner twists, edge flips, wing and center
+    placements and permutation parity are checked with array operations over
+    the whole batch, without trying to solve anything.
+    """
+    valid = np.ones(len(states), dtype=bool)
+    for check in _get_checks(states).values():
+        valid &= check
+    return valid
+
+
+def get_state_errors(facelets: np.ndarray) -> list[str]:
+    """Return the checks failed by the (6, size, size) `facelets`."""
+    checks = _get_checks(facelets[np.newaxis])
+    return [error for error, check in checks.items() if not check[0]]
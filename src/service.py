@@ -0,0 +1,258 @@
+import asyncio
+import json
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Optional
+
+from logic.facelet_string import from_facelet_string, to_facelet_string
+from logic.memory import MemoryBudget
+from logic.move import format_moves, parse_moves
+from logic.pool import RubiksCubePool
+from logic.rubiks_cube import RubiksCube
+from logic.solver import get_corner_distances, solve
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+SERVER_ERROR = -32000
+
+# Bounds of a search, the budget taking a few seconds for a 3x3x3, as a
+# running search holds a worker until it ends
+MAX_SOLVE_DEPTH = 20
+MAX_SOLVE_NODES = 20_000
+# Memory the Rubik's cube of a session can take
+MAX_SESSION_BYTES = 1 << 24
+
+
+class ServiceError(Exception):
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class Latency:
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, duration: float) -> None:
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "mean_ms": 1000 * self.total / self.count if self.count else 0.0,
+            "max_ms": 1000 * self.max,
+        }
+
+
+class CubeService:
+    """Named cube sessions served over JSON-RPC 2.0, one message per line.
+
+    Requests are handled on the event loop, except solving, which runs in a
+    pool of processes so that the loop never blocks on it. Batches are JSON
+    arrays of requests, handled concurrently.
+
+    Searches expand at most `max_nodes` states, and a session can't hold a
+    Rubik's cube taking more memory than `memory_budget` allows.
+    """
+
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        max_nodes: int = MAX_SOLVE_NODES,
+        memory_budget: Optional[MemoryBudget] = None,
+    ) -> None:
+        self.max_nodes = max_nodes
+        self.memory_budget = memory_budget or MemoryBudget(MAX_SESSION_BYTES)
+        self.sessions: dict[str, RubiksCube] = {}
+        self.pool = RubiksCubePool()
+        self.executor = executor or ProcessPoolExecutor(initializer=_init_worker)
+        self.latencies: dict[str, Latency] = {}
+        self.methods: dict[str, Callable[..., Awaitable[Any]]] = {
+            "create": self.create,
+            "delete": self.delete,
+            "move": self.move,
+            "query": self.query,
+            "solve": self.solve,
+            "stats": self.stats,
+        }
+
+    async def create(self, session: str, size: int, state: Optional[str] = None) -> Any:
+        _check_type("session", session, str)
+        _check_type("size", size, int)
+        if state is not None:
+            _check_type("state", state, str)
+        if size <= 0:
+            raise ServiceError(INVALID_PARAMS, "'size' must be a positive integer")
+        try:
+            self.memory_budget.check(size, 1, "rubiks_cube")
+        except MemoryError as error:
+            raise ServiceError(INVALID_PARAMS, str(error)) from error
+
+        rubiks_cube = self.pool.acquire(size)
+        if state is not None:
+            try:
+                rubiks_cube.set_facelets(from_facelet_string(state))
+            except ValueError:
+                self.pool.release(rubiks_cube)
+                raise
+
+        if session in self.sessions:
+            self.pool.release(self.sessions[session])
+        self.sessions[session] = rubiks_cube
+        return self._get_state(rubiks_cube)
+
+    async def delete(self, session: str) -> Any:
+        self.pool.release(self._get_session(session))
+        del self.sessions[session]
+        return None
+
+    async def move(self, session: str, moves: str) -> Any:
+        _check_type("moves", moves, str)
+        rubiks_cube = self._get_session(session)
+        parsed_moves = parse_moves(moves)
+        if any(move.number >= rubiks_cube.size for move in parsed_moves):
+            raise ServiceError(
+                INVALID_PARAMS, f"moves must turn layers below {rubiks_cube.size}"
+            )
+
+        for move in parsed_moves:
+            rubiks_cube.rotate(move)
+        return self._get_state(rubiks_cube)
+
+    async def query(self, session: str) -> Any:
+        rubiks_cube = self._get_session(session)
+        return {**self._get_state(rubiks_cube), "valid": rubiks_cube.is_valid()}
+
+    async def solve(self, session: str, max_depth: int = 12) -> Any:
+        _check_type("max_depth", max_depth, int)
+        if not 0 <= max_depth <= MAX_SOLVE_DEPTH:
+            raise ServiceError(
+                INVALID_PARAMS, f"'max_depth' must be between 0 and {MAX_SOLVE_DEPTH}"
+            )
+
+        # null when the search runs out of depth or nodes
+        facelets = self._get_session(session).get_facelets()
+        solution = await asyncio.get_running_loop().run_in_executor(
+            self.executor, solve, facelets, max_depth, self.max_nodes
+        )
+        return None if solution is None else format_moves(solution)
+
+    async def stats(self) -> Any:
+        return {method: latency.to_dict() for method, latency in self.latencies.items()}
+
+    async def handle(self, message: Any) -> Any:
+        """Return the response to a request or batch of requests, None for
+        notifications."""
+        if isinstance(message, list):
+            if not message:
+                return _get_error(None, INVALID_REQUEST, "empty batch")
+            responses = await asyncio.gather(
+                *(self._handle_request(request) for request in message)
+            )
+            return [response for response in responses if response is not None] or None
+        return await self._handle_request(message)
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while line := await reader.readline():
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError as error:
+                    response = _get_error(None, PARSE_ERROR, str(error))
+                else:
+                    response = await self.handle(message)
+
+                if response is not None:
+                    writer.write(json.dumps(response).encode() + b"\n")
+                    await writer.drain()
+        finally:
+            writer.close()
+
+    async def _handle_request(self, request: Any) -> Any:
+        if not isinstance(request, dict) or request.get("jsonrpc") != "2.0":
+            return _get_error(None, INVALID_REQUEST, "invalid JSON-RPC 2.0 request")
+
+        request_id = request.get("id")
+        name = request.get("method")
+        if not isinstance(name, str):
+            return _get_error(request_id, INVALID_REQUEST, "'method' must be a string")
+        method = self.methods.get(name)
+        if method is None:
+            return _get_error(request_id, METHOD_NOT_FOUND, f"no method {name!r}")
+
+        params = request.get("params", {})
+        start = time.perf_counter()
+        try:
+            if isinstance(params, list):
+                result = await method(*params)
+            elif isinstance(params, dict):
+                result = await method(**params)
+            else:
+                raise ServiceError(INVALID_PARAMS, "params must be an array or object")
+        except ServiceError as error:
+            response = _get_error(request_id, error.code, error.message)
+        except (TypeError, ValueError) as error:
+            response = _get_error(request_id, INVALID_PARAMS, str(error))
+        except Exception as error:
+            # Any other failure, such as running out of memory, only fails
+            # this request rather than the connection or the batch
+            message = f"internal error: {type(error).__name__}"
+            response = _get_error(request_id, INTERNAL_ERROR, message)
+        else:
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        finally:
+            latency = self.latencies.setdefault(name, Latency())
+            latency.add(time.perf_counter() - start)
+
+        return response if "id" in request else None
+
+    def _get_session(self, session: str) -> RubiksCube:
+        _check_type("session", session, str)
+        if session not in self.sessions:
+            raise ServiceError(SERVER_ERROR, f"unknown session {session!r}")
+        return self.sessions[session]
+
+    def _get_state(self, rubiks_cube: RubiksCube) -> dict[str, Any]:
+        return {
+            "state": to_facelet_string(rubiks_cube.facelets),
+            "finished": rubiks_cube.is_finished(),
+        }
+
+
+def _check_type(name: str, value: Any, expected: type) -> None:
+    # bool is a subclass of int, but true isn't a size
+    if not isinstance(value, expected) or isinstance(value, bool):
+        raise ServiceError(
+            INVALID_PARAMS, f"{name!r} must be of type {expected.__name__}"
+        )
+
+
+def _get_error(request_id: Any, code: int, message: str) -> dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "error": {"code": code, "message": message},
+    }
+
+
+def _init_worker() -> None:
+    # Builds the corners database once per process rather than on first solve
+    get_corner_distances()
+
+
+async def serve(host: str, port: int, service: Optional[CubeService] = None) -> None:
+    service = service or CubeService()
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    async with server:
+        await server.serve_forever()
@@ -2,3 +2,5 @@ CUBE_SIZE = 0.3
 NUMBER_OF_FRAMES = 6
 RUBIKS_CUBE_SIZE = 3
 SHUFFLE_NUMBER_OF_ROTATIONS = 20
+ROTATION_DURATION = 0.2
+LOD_SIZE = 10
@@ -1 +1,12 @@
-from .display import RubiksCubeDisplay  # noqa
+from typing import Any
+
+# The display pulls in matplotlib, so it is only imported when first used
+__all__ = ["RubiksCubeDisplay"]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "RubiksCubeDisplay":
+        from .display import RubiksCubeDisplay
+
+        return RubiksCubeDisplay
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,22 +1,46 @@
-from typing import Any
+import time
+from collections import deque
+from typing import Any, ClassVar, Iterable, Optional
 
 import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib.animation import FuncAnimation
+from matplotlib.colors import to_rgba_array
+from matplotlib.figure import Figure
 from matplotlib.widgets import Button
+from mpl_toolkits.mplot3d import proj3d
 from mpl_toolkits.mplot3d.art3d import Poly3DCollection
 
 import settings
-from logic.cube import Cube
+from logic.enums import Axis, Color
+from logic.facelets import FACES, NORMALS, get_facelet_coordinates
+from logic.move import Move, get_random_moves
 from logic.rubiks_cube import RubiksCube
 
+FRAME_INTERVAL = 16  # ms
+# RGBA color of each color code of the facelets
+FACELET_COLORS = to_rgba_array([color.value for color in Color])
+# Corners of a sticker around its center, along its rows and columns
+STICKER_CORNERS = np.array([[-1, -1], [-1, 1], [1, 1], [1, -1]]) / 2
+
 
 class RubiksCubeDisplay:
+    # Methods timed by the instrumentation
+    HOT_PATHS: ClassVar[tuple[str, ...]] = (
+        "draw_pose",
+        "fast_forward",
+        "_update",
+        "_start_move",
+        "_rotate_faces",
+        "_set_static_verts",
+        "_blit_layer",
+    )
+
     def __init__(
         self,
         rubiks_cube: RubiksCube,
         cube_size: float,
         number_of_frames: int,
+        figure: Optional[Figure] = None,
     ) -> None:
         if number_of_frames <= 0:
             raise ValueError("`'number_of_frames' must be greater than 0")
@@ -24,16 +48,52 @@ class RubiksCubeDisplay:
             raise ValueError("'cube_size' must be greater than 0")
 
         self.rubiks_cube = rubiks_cube
-        self.cubedisplay_mapper: dict[Cube, CubeDisplay] = {}
         self.cube_size = cube_size
         self.number_of_frames = number_of_frames
         self.rotation_angle = np.pi / (2 * self.number_of_frames)
         self.center = self.cube_size * self.rubiks_cube.size / 2
 
-        self.fig = plt.figure()
+        # Stickers are drawn from the facelets of the Rubik's cube, one face of
+        # the collection per facelet, the inner faces of the cubes being always
+        # hidden. Big cubes are drawn with a level of detail, the stickers that
+        # aren't turning being merged into runs of the same color.
+        number_of_faces = len(FACES) * self.rubiks_cube.size**2
+        self.is_lod = self.rubiks_cube.size >= settings.LOD_SIZE
+        self.face_origins, self.face_axes = self._get_face_geometry()
+        self.grid_verts = self._get_grid_verts()
+        self.verts = self.grid_verts.copy()
+        self.facecolors = np.zeros((number_of_faces, 4))
+        self.cubes3d = Poly3DCollection(self.verts, edgecolor="#000000")
+        # The turning layer is drawn by its own animated collection, over a
+        # cached background of the rest of the figure
+        self.layer3d = Poly3DCollection(
+            self.verts[:0],
+            edgecolor="#000000",
+            animated=True,
+            visible=False,
+        )
+        self.static_faces = np.ones(number_of_faces, dtype=bool)
+        self.background: Any = None
+
+        self.rotations = {axis: self._get_rotations(axis) for axis in Axis}
+        # Turning layers are rotated from their pose at the start of the move
+        self.base_verts = np.empty((number_of_faces, 4, 3))
+        self.rotated_verts = np.empty((number_of_faces, 4, 3))
+
+        # Moves are played one after the other by a single timer, the logical
+        # move being applied when its animation starts
+        self.pending_moves: deque[Move] = deque()
+        self.current_move: Optional[Move] = None
+        self.current_faces = np.empty(0, dtype=int)
+        self.current_step = 0
+        self.move_start = 0.0
+
+        # Figures without a pyplot window render offscreen
+        self.fig = plt.figure() if figure is None else figure
         self.fig.suptitle("Rubik's Cube")
         self.ax = self.fig.add_subplot(projection="3d")
         self.ax.set_axis_off()
+        self.fig.canvas.mpl_connect("draw_event", self._cache_background)
 
     def display(self) -> None:
         self._add_cubes_to_ax()
@@ -47,175 +107,294 @@ class RubiksCubeDisplay:
         is_finished_button = Button(plt.axes((0.84, 0.05, 0.13, 0.075)), "Finished ?")
         is_finished_button.on_clicked(self._is_finished)
 
+        skip_button = Button(plt.axes((0.03, 0.05, 0.1, 0.075)), "Skip")
+        skip_button.on_clicked(lambda event: self.fast_forward())
+
+        timer = self.fig.canvas.new_timer(interval=FRAME_INTERVAL)
+        timer.add_callback(self._update)
+        timer.start()
+
         plt.show()
 
+    def queue_moves(self, moves: Iterable[Move]) -> None:
+        self.pending_moves.extend(moves)
+
+    def fast_forward(self) -> None:
+        # Jumps to the end of the current and pending moves without animation
+        if self.current_move is not None:
+            self._snap_layer(self.current_move)
+            self._end_move()
+
+        while self.pending_moves:
+            move = self.pending_moves.popleft()
+            self.rubiks_cube.rotate(move)
+            self._snap_layer(move)
+
+        self._set_static_verts()
+        self.fig.canvas.draw_idle()
+
     def _add_cubes_to_ax(self) -> None:
-        for y in range(self.rubiks_cube.size):  # slice
-            for z in range(self.rubiks_cube.size):  # row
-                for x in range(self.rubiks_cube.size):  # cube in a row
-                    cube = self.rubiks_cube.cubes[y, z, x]
-                    cube_display = self.cubedisplay_mapper.setdefault(
-                        cube,
-                        CubeDisplay(
-                            cube,
-                            self.cube_size,
-                            x * self.cube_size,
-                            y * self.cube_size,
-                            z * self.cube_size,
-                        ),
-                    )
-
-                    self.ax.add_collection3d(cube_display.cube3d)  # type: ignore
+        self._snap_cubes()
+        self.ax.add_collection3d(self.cubes3d)  # type: ignore
+        self.ax.add_collection3d(self.layer3d)  # type: ignore
+
+    def _snap_cubes(self) -> None:
+        self.verts[:] = self.grid_verts
+        self.facecolors[:] = FACELET_COLORS[self.rubiks_cube.facelets.ravel()]
+        self._set_static_verts()
+
+    def _get_face_geometry(self) -> tuple[np.ndarray, np.ndarray]:
+        # A point at `row` and `column` (in stickers) of face `f` lies at
+        # `origins[f] + (row, column) @ axes[f]`
+        ys, zs, xs = get_facelet_coordinates(max(self.rubiks_cube.size, 2))
+        coordinates = np.stack([xs, ys, zs], axis=-1)
+        axes = np.stack(
+            [
+                coordinates[:, 1, 0] - coordinates[:, 0, 0],
+                coordinates[:, 0, 1] - coordinates[:, 0, 0],
+            ],
+            axis=1,
+        )
+        centers = coordinates[:, 0, 0] + 0.5 + NORMALS / 2
+        origins = centers - axes.sum(axis=1) / 2
+        return origins * self.cube_size, axes * self.cube_size
+
+    def _get_grid_verts(self) -> np.ndarray:
+        size = self.rubiks_cube.size
+        rows, columns = np.indices((size, size)) + 0.5
+        centers = np.stack([rows, columns], axis=-1)
+        corners = centers[:, :, np.newaxis] + STICKER_CORNERS  # (size, size, 4, 2)
+        verts = self.face_origins[:, np.newaxis, np.newaxis, np.newaxis] + np.einsum(
+            "rcki,fij->frckj", corners, self.face_axes
+        )
+        grid_verts: np.ndarray = verts.reshape(-1, 4, 3)
+        grid_verts.setflags(write=False)
+        return grid_verts
+
+    def _get_lod_polygons(self, hidden: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        # Each row of stickers is drawn as runs of stickers of the same color,
+        # the hidden stickers being left out
+        size = self.rubiks_cube.size
+        codes = self.rubiks_cube.facelets.astype(int).reshape(len(FACES), -1)
+        codes[hidden.reshape(codes.shape)] = -1
+
+        all_verts, all_colors = [], []
+        for face, face_codes in enumerate(codes):
+            is_start = np.ones(face_codes.shape, dtype=bool)
+            is_start[1:] = face_codes[1:] != face_codes[:-1]
+            is_start[::size] = True
+            starts = np.flatnonzero(is_start)
+            ends = np.append(starts[1:], len(face_codes))
+
+            runs = face_codes[starts] >= 0
+            rows, columns = np.divmod(starts[runs], size)
+            lengths = (ends - starts)[runs]
+            corners = np.stack(
+                [
+                    np.stack([rows, columns], -1),
+                    np.stack([rows, columns + lengths], -1),
+                    np.stack([rows + 1, columns + lengths], -1),
+                    np.stack([rows + 1, columns], -1),
+                ],
+                axis=1,
+            )
+            all_verts.append(self.face_origins[face] + corners @ self.face_axes[face])
+            all_colors.append(FACELET_COLORS[face_codes[starts[runs]]])
+        return np.concatenate(all_verts), np.concatenate(all_colors)
 
     def _reset(self, event: Any) -> None:
+        self.pending_moves.clear()
+        if self.current_move is not None:
+            self._end_move()
         self.rubiks_cube.reset()
 
-        self.ax.clear()
-        self.ax.set_axis_off()
-        self._add_cubes_to_ax()
-        plt.draw()
+        self._snap_cubes()
+        self.fig.canvas.draw_idle()
 
     def _shuffle(self, event: Any) -> None:
-        for (
-            slice_was_rotated,
-            row_was_rotated,
-            column_was_rotated,
-            number,
-        ) in self.rubiks_cube.shuffle(settings.SHUFFLE_NUMBER_OF_ROTATIONS):
-            if slice_was_rotated:
-                f = self._rotate_slice
-            elif row_was_rotated:
-                f = self._rotate_row
-            elif column_was_rotated:
-                f = self._rotate_column
-
-            # prevents the variable to get deleted as it is needed by matplotlib
-            anim = FuncAnimation(  # noqa
-                self.fig,
-                f,  # type: ignore
-                frames=np.full(self.number_of_frames, number),
-                init_func=lambda: None,  # type: ignore
-                interval=30,
-                repeat=False,
+        self.queue_moves(
+            get_random_moves(
+                self.rubiks_cube.size, settings.SHUFFLE_NUMBER_OF_ROTATIONS
             )
+        )
 
-            plt.draw()
-            plt.pause(0.5)
+    def _update(self) -> None:
+        # Animation steps are derived from the elapsed time, so that steps and
+        # even whole moves are dropped when drawing can't keep up
+        now = time.perf_counter()
+        start = now
+        has_changed = has_ended = False
 
-    def _is_finished(self, event: Any) -> None:
-        is_finished = self.rubiks_cube.is_finished()
-        print(is_finished)
+        while self.current_move is not None or self.pending_moves:
+            if self.current_move is None:
+                move = self.pending_moves.popleft()
+                if now - start >= settings.ROTATION_DURATION:
+                    # Moves that already ended are snapped as by fast_forward,
+                    # only the one shown being split from the cube and drawn
+                    self.rubiks_cube.rotate(move)
+                    self._snap_layer(move)
+                    start += settings.ROTATION_DURATION
+                    has_ended = True
+                    continue
+                self._start_move(move, start)
 
-    def _rotate_slice(self, number: int) -> None:
-        for cube in self.rubiks_cube.cubes[number, :, :].flatten():
-            cubedisplay = self.cubedisplay_mapper[cube]
-            cubedisplay.rotate(self.center, 0, self.center, self.rotation_angle)
+            assert self.current_move is not None
+            elapsed = now - self.move_start
+            step = int(elapsed / settings.ROTATION_DURATION * self.number_of_frames)
+            if step < self.number_of_frames:
+                if step != self.current_step:
+                    self._rotate_faces(self.current_faces, self.current_move, step)
+                    self.current_step = step
+                    has_changed = True
+                break
 
-    def _rotate_row(self, number: int) -> None:
-        for cube in self.rubiks_cube.cubes[:, number, :].flatten():
-            cubedisplay = self.cubedisplay_mapper[cube]
-            cubedisplay.rotate(self.center, self.center, 0, self.rotation_angle)
+            # the next move starts right when this one ended
+            self._snap_layer(self.current_move)
+            self._end_move()
+            start = self.move_start + settings.ROTATION_DURATION
+            has_ended = True
 
-    def _rotate_column(self, number: int) -> None:
-        for cube in self.rubiks_cube.cubes[:, :, number].flatten():
-            cubedisplay = self.cubedisplay_mapper[cube]
-            cubedisplay.rotate(0, self.center, self.center, self.rotation_angle)
+        if self.current_move is None:
+            if has_ended:
+                self._set_static_verts()
+                self.fig.canvas.draw_idle()
+        elif has_changed:
+            self._blit_layer()
 
+    def _start_move(self, move: Move, start: float) -> None:
+        self.rubiks_cube.rotate(move)
+        self.current_faces = self._start_rotation(move)
+        self.current_move = move
+        self.current_step = 0
+        self.move_start = start
 
-class CubeDisplay:
-    def __init__(
-        self,
-        cube: Cube,
-        cube_size: float,
-        x_start: float,
-        y_start: float,
-        z_start: float,
+        # The rest of the cube is drawn once into the background, unless the
+        # layer is behind it, in which case it is drawn after the layer
+        self._split_layer(self.current_faces)
+        self.cubes3d.set_animated(self._is_layer_behind(move))
+        self.fig.canvas.draw()
+
+    def draw_pose(
+        self, facelets: np.ndarray, move: Optional[Move] = None, step: int = 0
     ) -> None:
-        facecolors = [color.value for color in cube.facecolors.values()]
-        self.verts = self._get_verts(cube_size, x_start, y_start, z_start)
-        self.cube3d = Poly3DCollection(
-            self.verts, facecolors=facecolors, edgecolor="#000000"
-        )
+        """Draw the Rubik's cube with the given `facelets`, the layer of `move`
+        being turned by `step` frames, in a single full draw of the figure."""
+        self.rubiks_cube.set_facelets(facelets)
+        self._snap_cubes()
+        if move is not None:
+            faces = self._start_rotation(move)
+            self._rotate_faces(faces, move, step)
+            self._split_layer(faces)
+            self.layer3d.set_animated(False)
 
-    def rotate(self, x: float, y: float, z: float, alpha: float) -> None:
-        if x == 0:  # column
-            rotation = np.array(
-                [
-                    [1, 0, 0],
-                    [0, np.cos(alpha), -np.sin(alpha)],
-                    [0, np.sin(alpha), np.cos(alpha)],
-                ]
-            )
-        elif y == 0:  # slice
-            rotation = np.array(
-                [
-                    [np.cos(alpha), 0, np.sin(alpha)],
-                    [0, 1, 0],
-                    [-np.sin(alpha), 0, np.cos(alpha)],
-                ]
-            )
-        elif z == 0:  # row
-            rotation = np.array(
-                [
-                    [np.cos(alpha), -np.sin(alpha), 0],
-                    [np.sin(alpha), np.cos(alpha), 0],
-                    [0, 0, 1],
-                ]
-            )
+        self.fig.canvas.draw()
+        self._end_move()
+        self.layer3d.set_animated(True)
 
-        self._translate(-x, -y, -z)
-        self._rotate(rotation)
-        self._translate(x, y, z)
-        self.cube3d.set_verts(self.verts)
+    def _split_layer(self, faces: np.ndarray) -> None:
+        self.static_faces[faces] = False
+        self._set_static_verts()
+        self.layer3d.set_verts(self.verts[faces])
+        self._set_facecolors(self.layer3d, self.facecolors[faces])
+        self.layer3d.set_visible(True)
 
-    def _translate(self, dx: float, dy: float, dz: float) -> None:
-        self.verts += np.full((6, 4, 3), [dx, dy, dz])
+    def _end_move(self) -> None:
+        self.current_move = None
+        self.static_faces[:] = True
+        self.cubes3d.set_animated(False)
+        self.layer3d.set_visible(False)
 
-    def _rotate(self, rotation: np.ndarray) -> None:
-        for i in range(self.verts.shape[0]):
-            for j in range(self.verts.shape[1]):
-                self.verts[i, j, :] = np.dot(self.verts[i, j, :], rotation)
+    def _set_static_verts(self) -> None:
+        if self.is_lod:
+            verts, facecolors = self._get_lod_polygons(~self.static_faces)
+        else:
+            verts = self.verts[self.static_faces]
+            facecolors = self.facecolors[self.static_faces]
+        self.cubes3d.set_verts(verts)
+        self._set_facecolors(self.cubes3d, facecolors)
 
-    def _get_verts(
-        self, cube_size: float, x_start: float, y_start: float, z_start: float
-    ) -> np.ndarray:
-        return np.array(
-            [
-                [
-                    [x_start, y_start, z_start],
-                    [x_start + cube_size, y_start, z_start],
-                    [x_start + cube_size, y_start, z_start + cube_size],
-                    [x_start, y_start, z_start + cube_size],
-                ],
-                [
-                    [x_start + cube_size, y_start, z_start],
-                    [x_start + cube_size, y_start + cube_size, z_start],
-                    [x_start + cube_size, y_start + cube_size, z_start + cube_size],
-                    [x_start + cube_size, y_start, z_start + cube_size],
-                ],
-                [
-                    [x_start, y_start + cube_size, z_start],
-                    [x_start + cube_size, y_start + cube_size, z_start],
-                    [x_start + cube_size, y_start + cube_size, z_start + cube_size],
-                    [x_start, y_start + cube_size, z_start + cube_size],
-                ],
-                [
-                    [x_start, y_start, z_start],
-                    [x_start, y_start + cube_size, z_start],
-                    [x_start, y_start + cube_size, z_start + cube_size],
-                    [x_start, y_start, z_start + cube_size],
-                ],
-                [
-                    [x_start, y_start, z_start],
-                    [x_start + cube_size, y_start, z_start],
-                    [x_start + cube_size, y_start + cube_size, z_start],
-                    [x_start, y_start + cube_size, z_start],
-                ],
-                [
-                    [x_start, y_start, z_start + cube_size],
-                    [x_start + cube_size, y_start, z_start + cube_size],
-                    [x_start + cube_size, y_start + cube_size, z_start + cube_size],
-                    [x_start, y_start + cube_size, z_start + cube_size],
-                ],
-            ]
+    def _set_facecolors(
+        self, collection: Poly3DCollection, facecolors: np.ndarray
+    ) -> None:
+        collection.set_facecolor(facecolors)
+        if self.is_lod:
+            # stickers aren't outlined when merged, their edges hiding seams
+            collection.set_edgecolor(facecolors)
+
+    def _is_layer_behind(self, move: Move) -> bool:
+        # Layers turn around their own center, so comparing its depth with the
+        # one of the center of the cube holds during the whole move
+        layer_center = np.full(3, self.center)
+        layer_center[[1, 2, 0][list(Axis).index(move.axis)]] = (
+            move.number + 0.5
+        ) * self.cube_size
+        _, _, layer_depth = proj3d.proj_transform(*layer_center, self.ax.get_proj())
+        _, _, center_depth = proj3d.proj_transform(
+            *np.full(3, self.center), self.ax.get_proj()
         )
+        return bool(layer_depth > center_depth)
+
+    def _cache_background(self, event: Any) -> None:
+        self.background = self.fig.canvas.copy_from_bbox(  # type: ignore
+            self.ax.bbox
+        )
+
+    def _blit_layer(self) -> None:
+        canvas = self.fig.canvas
+        if self.background is None or not canvas.supports_blit:
+            canvas.draw_idle()
+            return
+
+        canvas.restore_region(self.background)  # type: ignore
+        for collection in [self.layer3d, self.cubes3d]:
+            if collection.get_animated():
+                collection.do_3d_projection()
+                self.ax.draw_artist(collection)
+        canvas.blit(self.ax.bbox)
+
+    def _is_finished(self, event: Any) -> None:
+        is_finished = self.rubiks_cube.is_finished()
+        print(is_finished)
+
+    def _get_layer_faces(self, move: Move) -> np.ndarray:
+        ys, zs, xs = get_facelet_coordinates(self.rubiks_cube.size)
+        coordinates = {Axis.SLICE: ys, Axis.ROW: zs, Axis.COLUMN: xs}[move.axis]
+        return np.flatnonzero(coordinates == move.number)
+
+    def _start_rotation(self, move: Move) -> np.ndarray:
+        faces = self._get_layer_faces(move)
+        np.take(self.verts, faces, axis=0, out=self.base_verts[: len(faces)])
+        return faces
+
+    def _rotate_faces(self, faces: np.ndarray, move: Move, step: int) -> None:
+        # Each step rotates the layer from its base pose, so that errors never
+        # accumulate and steps can be skipped, the cubes being put back on the
+        # grid according to the Rubik's cube once the move is over
+        rotations, translations = self.rotations[move.axis]
+        rotated_verts = self.rotated_verts[: len(faces)]
+        np.matmul(self.base_verts[: len(faces)], rotations[step], out=rotated_verts)
+        rotated_verts += translations[step]
+        self.verts[faces] = rotated_verts
+        self.layer3d.set_verts(rotated_verts)
+
+    def _snap_layer(self, move: Move) -> None:
+        faces = self._get_layer_faces(move)
+        self.verts[faces] = self.grid_verts[faces]
+        self.facecolors[faces] = FACELET_COLORS[
+            self.rubiks_cube.facelets.ravel()[faces]
+        ]
+
+    def _get_rotations(self, axis: Axis) -> tuple[np.ndarray, np.ndarray]:
+        # Rotating `verts` by `step` frames around the center of the Rubik's
+        # cube is `verts @ rotations[step] + translations[step]`
+        angles = self.rotation_angle * np.arange(self.number_of_frames + 1)
+        cos, sin = np.cos(angles), np.sin(angles)
+        zeros, ones = np.zeros_like(angles), np.ones_like(angles)
+        rotations = {
+            Axis.COLUMN: [[ones, zeros, zeros], [zeros, cos, -sin], [zeros, sin, cos]],
+            Axis.SLICE: [[cos, zeros, sin], [zeros, ones, zeros], [-sin, zeros, cos]],
+            Axis.ROW: [[cos, -sin, zeros], [sin, cos, zeros], [zeros, zeros, ones]],
+        }[axis]
+        rotations_array = np.moveaxis(np.array(rotations), -1, 0)
+        center = np.full(3, self.center)
+        return rotations_array, center - center @ rotations_array
@@ -0,0 +1,226 @@
+import contextlib
+import os
+import shutil
+import subprocess
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import IO, Iterator, Optional, Sequence, Union
+
+import matplotlib as mpl
+import numpy as np
+from matplotlib import image
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from logic.move import Move
+from logic.rubiks_cube import RubiksCube
+
+from .display import RubiksCubeDisplay
+
+VIDEO_FORMATS = {".gif", ".mp4"}
+NO_MOVE = -1
+
+# Renderer and states of the worker processes, set up by `_init_worker`
+_renderer: Optional["FrameRenderer"] = None
+_states: Optional[np.ndarray] = None
+
+
+class FrameRenderer:
+    """Render poses of a Rubik's cube to RGB arrays on an offscreen figure."""
+
+    def __init__(
+        self,
+        size: int,
+        cube_size: float,
+        number_of_frames: int,
+        figsize: tuple[float, float],
+        dpi: float,
+    ) -> None:
+        figure = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasAgg(figure)
+        self.display = RubiksCubeDisplay(
+            RubiksCube(size), cube_size, number_of_frames, figure=figure
+        )
+        self.display.ax.add_collection3d(self.display.cubes3d)  # type: ignore
+        self.display.ax.add_collection3d(self.display.layer3d)  # type: ignore
+
+    def render(
+        self, facelets: np.ndarray, move: Optional[Move] = None, step: int = 0
+    ) -> np.ndarray:
+        self.display.draw_pose(facelets, move, step)
+        buffer = self.canvas.buffer_rgba()  # type: ignore
+        return np.asarray(buffer)[..., :3].copy()
+
+
+def get_frames(
+    rubiks_cube: RubiksCube, moves: Sequence[Move], number_of_frames: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the states before each of the `moves` and after the last one,
+    and the (state, move code, step) of each frame of their animation.
+
+    The layer of a move is turned from the state before it, the last frame
+    showing the final state.
+    """
+    states = rubiks_cube.allocate_snapshots(len(moves) + 1)
+    rubiks_cube = rubiks_cube.clone()
+    rubiks_cube.snapshot(out=states[0])
+    for index, move in enumerate(moves):
+        rubiks_cube.rotate(move)
+        rubiks_cube.snapshot(out=states[index + 1])
+
+    steps = np.arange(number_of_frames)
+    frames = np.zeros((len(moves) * number_of_frames + 1, 3), dtype=np.int64)
+    frames[:-1, 0] = np.repeat(np.arange(len(moves)), number_of_frames)
+    frames[:-1, 1] = np.repeat([move.encode() for move in moves], number_of_frames)
+    frames[:-1, 2] = np.tile(steps, len(moves))
+    frames[-1] = len(moves), NO_MOVE, 0
+    return states, frames
+
+
+def render_frames(
+    rubiks_cube: RubiksCube,
+    moves: Sequence[Move],
+    cube_size: float,
+    number_of_frames: int,
+    figsize: tuple[float, float] = (6.4, 4.8),
+    dpi: float = 100,
+    processes: Optional[int] = None,
+    chunk_size: int = 16,
+) -> Iterator[np.ndarray]:
+    """Yield the RGB frames animating `moves` from the state of `rubiks_cube`.
+
+    Chunks of frames are rendered in parallel by a pool of processes, each
+    with its own offscreen figure, and at most two chunks per process are in
+    flight so that memory stays bounded however long the animation.
+    """
+    states, frames = get_frames(rubiks_cube, moves, number_of_frames)
+    processes = processes or os.cpu_count() or 1
+    renderer_args = (rubiks_cube.size, cube_size, number_of_frames, figsize, dpi)
+
+    with ProcessPoolExecutor(
+        processes, initializer=_init_worker, initargs=(renderer_args, states)
+    ) as executor:
+        chunks = (
+            frames[start : start + chunk_size]
+            for start in range(0, len(frames), chunk_size)
+        )
+        futures: deque[Future[np.ndarray]] = deque()
+        for chunk in chunks:
+            futures.append(executor.submit(_render_chunk, chunk))
+            if len(futures) == 2 * processes:
+                break
+
+        while futures:
+            rendered = futures.popleft().result()
+            for chunk in chunks:
+                futures.append(executor.submit(_render_chunk, chunk))
+                break
+            yield from rendered
+
+
+def export_moves(
+    path: Union[str, os.PathLike[str]],
+    rubiks_cube: RubiksCube,
+    moves: Sequence[Move],
+    cube_size: float,
+    number_of_frames: int,
+    fps: int = 30,
+    figsize: tuple[float, float] = (6.4, 4.8),
+    dpi: float = 100,
+    processes: Optional[int] = None,
+) -> None:
+    """Export the animation of `moves` to a GIF or MP4 file, or to numbered
+    PNG files in the directory `path` for any other extension.
+
+    Videos are encoded by piping the frames to ffmpeg as they are rendered.
+    """
+    frames = render_frames(
+        rubiks_cube,
+        moves,
+        cube_size,
+        number_of_frames,
+        figsize=figsize,
+        dpi=dpi,
+        processes=processes,
+    )
+    extension = os.path.splitext(path)[1].lower()
+    if extension in VIDEO_FORMATS:
+        _encode_video(path, frames, fps)
+    else:
+        _write_pngs(path, frames)
+
+
+def _init_worker(
+    renderer_args: tuple[int, float, int, tuple[float, float], float],
+    states: np.ndarray,
+) -> None:
+    global _renderer, _states
+    _renderer = FrameRenderer(*renderer_args)
+    _states = states
+
+
+def _render_chunk(frames: np.ndarray) -> np.ndarray:
+    assert _renderer is not None and _states is not None
+    return np.stack(
+        [
+            _renderer.render(
+                _states[state], None if code == NO_MOVE else Move.decode(code), step
+            )
+            for state, code, step in frames
+        ]
+    )
+
+
+def _write_pngs(
+    directory: Union[str, os.PathLike[str]], frames: Iterator[np.ndarray]
+) -> None:
+    os.makedirs(directory, exist_ok=True)
+    for index, frame in enumerate(frames):
+        image.imsave(os.path.join(directory, f"frame_{index:05d}.png"), frame)
+
+
+def _encode_video(
+    path: Union[str, os.PathLike[str]],
+    frames: Iterator[np.ndarray],
+    fps: int,
+) -> None:
+    ffmpeg = shutil.which(mpl.rcParams["animation.ffmpeg_path"])
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg is required to export videos")
+
+    first_frame = next(frames)
+    height, width = first_frame.shape[:2]
+    command = [
+        ffmpeg,
+        "-y",
+        "-loglevel",
+        "error",
+        "-f",
+        "rawvideo",
+        "-pix_fmt",
+        "rgb24",
+        "-s",
+        f"{width}x{height}",
+        "-r",
+        str(fps),
+        "-i",
+        "-",
+    ]
+    if os.path.splitext(path)[1].lower() == ".mp4":
+        # yuv420p needs even dimensions
+        command += ["-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p"]
+    command.append(os.fspath(path))
+
+    with subprocess.Popen(command, stdin=subprocess.PIPE) as process:
+        stdin: IO[bytes] = process.stdin  # type: ignore
+        # ffmpeg exiting early breaks the pipe, which is reported below with
+        # its exit code
+        with contextlib.suppress(BrokenPipeError):
+            try:
+                stdin.write(first_frame.tobytes())
+                for frame in frames:
+                    stdin.write(frame.tobytes())
+            finally:
+                stdin.close()
+    if process.returncode:
+        raise RuntimeError(f"ffmpeg exited with code {process.returncode}")
@@ -0,0 +1,31 @@
+import numpy as np
+
+from logic.analysis import analyze_algorithm, get_cycles
+from logic.enums import Axis
+from logic.move import Move
+from logic.rubiks_cube import RubiksCube
+
+
+class TestAnalysis:
+    def test_get_cycles(self):
+        assert get_cycles(np.array([1, 2, 0, 3, 5, 4])) == [(0, 1, 2), (4, 5)]
+        assert get_cycles(np.arange(4)) == []
+
+    def test_analyze_algorithm_single_move(self):
+        analysis = analyze_algorithm(3, [Move(Axis.SLICE, 0)])
+        assert analysis.order == 4
+        assert sorted(len(cycle) for cycle in analysis.cycles) == [4] * 5
+
+    def test_analyze_algorithm_empty(self):
+        assert analyze_algorithm(3, []) == (1, [])
+
+    def test_analyze_algorithm_order_returns_to_solved(self):
+        moves = [Move(Axis.COLUMN, 2), Move(Axis.ROW, 2)]
+        analysis = analyze_algorithm(3, moves)
+        assert analysis.order == 105
+
+        rubiks_cube = RubiksCube(3)
+        for i in range(analysis.order):
+            rubiks_cube.rotate_column(2)
+            rubiks_cube.rotate_row(2)
+            assert rubiks_cube.is_finished() == (i == analysis.order - 1)
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from logic.environment import VectorEnv
+from logic.facelets import apply_algorithms, get_solved_facelets
+from logic.move import Move
+
+
+class TestVectorEnv:
+    def test_reset(self):
+        observations = VectorEnv(3, seed=0).reset(8)
+        assert observations.shape == (8, 6, 3, 3)
+        assert observations.dtype == np.uint8
+        assert observations.flags.c_contiguous
+        assert np.array_equal(observations, VectorEnv(3, seed=0).reset(8))
+
+    def test_step(self):
+        env = VectorEnv(3, seed=0)
+        observations = env.reset(4)
+        actions = np.array([0, 4, 8, 2])
+        result = env.step(actions)
+
+        moves = [[Move.decode(action)] for action in actions]
+        assert np.array_equal(
+            result.observations, apply_algorithms(observations, moves)
+        )
+        assert not result.terminated.any() and not result.truncated.any()
+        assert result.rewards.dtype == np.float32
+
+    def test_solved_episodes_are_reset(self):
+        env = VectorEnv(3, scramble_moves=1, seed=0)
+        env.reset(16)
+        # Scrambles of one move are solved by turning the layer three times
+        solved = get_solved_facelets(3).reshape(-1)
+        actions = np.array(
+            [
+                next(
+                    code
+                    for code, permutation in enumerate(env.permutations)
+                    if np.array_equal(
+                        state[permutation][permutation][permutation], solved
+                    )
+                )
+                for state in env.states
+            ]
+        )
+        env.step(actions)
+        env.step(actions)
+        result = env.step(actions)
+
+        assert result.terminated.all()
+        assert np.array_equal(result.rewards, np.ones(16))
+        assert (
+            not (result.observations == get_solved_facelets(3))
+            .all(axis=(1, 2, 3))
+            .any()
+        )
+        assert np.array_equal(env.steps, np.zeros(16))
+
+    def test_truncated(self):
+        env = VectorEnv(2, max_steps=2, seed=0)
+        env.reset(3)
+        env.step(np.zeros(3, dtype=int))
+        result = env.step(np.zeros(3, dtype=int))
+        assert np.array_equal(result.truncated, ~result.terminated)
+
+    def test_no_environments(self):
+        env = VectorEnv(3)
+        result = env.step(np.zeros(0, dtype=int))
+        assert result.observations.shape == (0, 6, 3, 3)
+        assert result.terminated.shape == result.truncated.shape == (0,)
+
+        env.reset(0)
+        assert env.step(np.zeros(0, dtype=int)).rewards.shape == (0,)
+
+    def test_invalid_actions(self):
+        env = VectorEnv(3)
+        env.reset(2)
+        with pytest.raises(ValueError):
+            env.step(np.array([0]))
+        with pytest.raises(ValueError):
+            env.step(np.array([0, 9]))
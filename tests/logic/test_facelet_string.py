@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from logic.facelet_string import (
+    format_facelet_strings,
+    from_facelet_string,
+    load_facelet_strings,
+    parse_facelet_strings,
+    to_facelet_string,
+)
+from logic.facelets import get_solved_facelets
+from logic.rubiks_cube import RubiksCube
+
+SOLVED_3X3 = "UUUUUUUUURRRRRRRRRFFFFFFFFFDDDDDDDDDLLLLLLLLLBBBBBBBBB"
+
+
+class TestFaceletString:
+    def test_to_facelet_string(self):
+        assert to_facelet_string(get_solved_facelets(3)) == SOLVED_3X3
+        assert len(to_facelet_string(get_solved_facelets(5))) == 150
+
+    def test_from_facelet_string(self):
+        assert np.array_equal(from_facelet_string(SOLVED_3X3), get_solved_facelets(3))
+
+    def test_top_row_turn(self):
+        rubiks_cube = RubiksCube(3)
+        rubiks_cube.rotate_row(2)
+        text = to_facelet_string(rubiks_cube.get_facelets())
+        # the top layer turns, carrying the top row of every side face along
+        assert text[:9] == "UUUUUUUUU"
+        assert text[9:12] != "RRR"
+        assert text[12:18] == "RRRRRR"
+
+    def test_round_trip(self):
+        rubiks_cube = RubiksCube(4)
+        for _ in rubiks_cube.shuffle(30):
+            pass
+        text = to_facelet_string(rubiks_cube.get_facelets())
+
+        imported = RubiksCube(4)
+        imported.set_facelets(from_facelet_string(text))
+        assert np.array_equal(imported.get_facelets(), rubiks_cube.get_facelets())
+        assert all(
+            imported.cubes[index] == rubiks_cube.cubes[index]
+            for index in np.ndindex(imported.cubes.shape)
+        )
+
+    def test_parse_facelet_strings(self):
+        states = np.stack([get_solved_facelets(3)] * 3)
+        states[1, 0, 0, 0] = states[1, 1, 0, 0]
+        data = format_facelet_strings(states)
+        assert data.count(b"\n") == 3
+        assert np.array_equal(parse_facelet_strings(data), states)
+        assert np.array_equal(parse_facelet_strings(data.rstrip(b"\n")), states)
+        assert np.array_equal(
+            parse_facelet_strings(data.replace(b"\n", b"\r\n")), states
+        )
+
+    @pytest.mark.parametrize(
+        "data", [b"", b"UUU\n", SOLVED_3X3.encode() + b"\nUUU\n", b"X" * 54]
+    )
+    def test_parse_facelet_strings_invalid(self, data):
+        with pytest.raises(ValueError):
+            parse_facelet_strings(data)
+
+    def test_load_facelet_strings(self, tmp_path):
+        path = tmp_path / "states.txt"
+        path.write_text(f"{SOLVED_3X3}\n{SOLVED_3X3}\n")
+        assert load_facelet_strings(path).shape == (2, 6, 3, 3)
@@ -0,0 +1,155 @@
+import copy
+import random
+
+import numpy as np
+import pytest
+
+from logic.enums import Axis
+from logic.facelets import (
+    FACES,
+    apply_algorithms,
+    are_solved,
+    get_algorithm_permutation,
+    get_center_facelets,
+    get_corner_facelets,
+    get_edge_facelets,
+    get_facelet_coordinates,
+    get_facelet_orbits,
+    get_move_permutation,
+    get_solved_facelets,
+    get_wing_facelets,
+    pack_states,
+    unpack_states,
+)
+from logic.move import Move, get_random_moves
+from logic.rubiks_cube import RubiksCube
+
+
+def rotate_cubes(cubes, move):
+    # Turns the layer of the cubes one cube at a time, as a reference
+    size = len(cubes)
+    number = move.number
+    layer = copy.deepcopy(
+        {
+            Axis.SLICE: cubes[number],
+            Axis.ROW: cubes[:, number],
+            Axis.COLUMN: cubes[:, :, number],
+        }[move.axis]
+    )
+    for u in range(size):
+        for v in range(size):
+            if move.axis is Axis.SLICE:
+                cubes[number, u, v] = cube = layer[size - 1 - v, u]
+                cube.rotate_xz()
+            elif move.axis is Axis.ROW:
+                cubes[u, number, v] = cube = layer[v, size - 1 - u]
+                cube.rotate_xy()
+            else:
+                cubes[u, v, number] = cube = layer[size - 1 - v, u]
+                cube.rotate_yz()
+
+
+class TestFacelets:
+    def test_get_facelet_coordinates(self):
+        ys, zs, xs = get_facelet_coordinates(3)
+        assert (ys[0] == 0).all()  # front
+        assert (xs[1] == 2).all()  # right
+        assert (zs[5] == 2).all()  # top
+        assert (ys[0, 0, 0], zs[0, 0, 0], xs[0, 0, 0]) == (0, 2, 0)
+        assert (ys[5, 0, 0], zs[5, 0, 0], xs[5, 0, 0]) == (2, 2, 0)
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 4, 5])
+    def test_get_move_permutation_matches_cubes(self, size):
+        random.seed(size)
+        cubes = copy.deepcopy(RubiksCube(size).cubes)
+        colors = get_solved_facelets(size)
+
+        for _ in range(20):
+            move = Move(random.choice(list(Axis)), random.randrange(size))
+            rotate_cubes(cubes, move)
+            colors = colors.flatten()[get_move_permutation(size, move)]
+
+            # cubes built from the facelets must match the rotated cubes
+            expected = RubiksCube(size)
+            expected.set_facelets(colors.reshape(-1, size, size))
+            assert np.array_equal(expected.cubes, cubes)
+
+    def test_get_move_permutation_out_of_range(self):
+        with pytest.raises(ValueError):
+            get_move_permutation(3, Move(Axis.ROW, 3))
+
+    def test_get_algorithm_permutation(self):
+        move = Move(Axis.COLUMN, 0)
+        assert np.array_equal(get_algorithm_permutation(3, [move] * 4), np.arange(54))
+        assert np.array_equal(
+            get_algorithm_permutation(3, [move]), get_move_permutation(3, move)
+        )
+
+    def test_apply_algorithms(self):
+        algorithms = [
+            [Move(Axis.SLICE, 0), Move(Axis.ROW, 2)],
+            [],
+            [Move(Axis.COLUMN, 1)],
+        ]
+        states = apply_algorithms(np.stack([get_solved_facelets(3)] * 3), algorithms)
+
+        for state, moves in zip(states, algorithms):
+            rubiks_cube = RubiksCube(3)
+            for move in moves:
+                rubiks_cube.rotate(move)
+            assert np.array_equal(state, rubiks_cube.facelets)
+
+        empty = np.empty((0, 6, 3, 3), dtype=np.uint8)
+        assert apply_algorithms(empty, []).shape == empty.shape
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 5])
+    def test_pack_states(self, size):
+        rubiks_cube = RubiksCube(size)
+        states = rubiks_cube.allocate_snapshots(4)
+        for state in states:
+            for move in get_random_moves(size, 10):
+                rubiks_cube.rotate(move)
+            rubiks_cube.snapshot(out=state)
+
+        packed = pack_states(states)
+        assert packed.shape == (4, -(-6 * size * size * 3 // 8))
+        assert np.array_equal(unpack_states(packed, size), states)
+
+        empty = unpack_states(pack_states(states[:0]), size)
+        assert empty.shape == (0, 6, size, size)
+
+    def test_are_solved(self):
+        states = apply_algorithms(
+            np.stack([get_solved_facelets(3)] * 3),
+            [[], [Move(Axis.ROW, 1)], [Move(Axis.ROW, 0)] * 4],
+        )
+        assert list(are_solved(states)) == [True, False, True]
+        assert list(are_solved(states.reshape(3, -1))) == [True, False, True]
+        assert are_solved(states[:0]).shape == (0,)
+        assert are_solved(states[:0].reshape(0, 54)).shape == (0,)
+
+    def test_get_solved_facelets(self):
+        for size in range(1, 5):
+            assert np.array_equal(
+                get_solved_facelets(size), RubiksCube(size).get_facelets()
+            )
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 4, 5, 6, 7])
+    def test_pieces_cover_all_facelets(self, size):
+        facelets = np.concatenate(
+            [
+                get_corner_facelets(size).flatten(),
+                get_edge_facelets(size).flatten(),
+                get_wing_facelets(size).flatten(),
+                get_center_facelets(size),
+            ]
+        )
+        assert len(set(facelets)) == len(facelets)
+        assert len(get_edge_facelets(size)) == (12 if size % 2 and size > 1 else 0)
+        assert len(get_wing_facelets(size)) == max(size - 2, 0) // 2
+
+    @pytest.mark.parametrize("size", [2, 3, 4, 5, 6, 7])
+    def test_get_facelet_orbits(self, size):
+        _, orbit_sizes = np.unique(get_facelet_orbits(size), return_counts=True)
+        assert set(orbit_sizes) <= {6, 24, 48}
+        assert orbit_sizes.sum() == len(FACES) * size * size
@@ -0,0 +1,46 @@
+from logic.enums import Axis
+from logic.farm import SolveFarm
+from logic.move import Move
+from logic.rubiks_cube import RubiksCube
+
+
+def get_states(count, consumed):
+    for index in range(count):
+        consumed.append(index)
+        rubiks_cube = RubiksCube(3)
+        rubiks_cube.rotate(Move(list(Axis)[index % 3], index % 3))
+        yield rubiks_cube.get_facelets()
+
+
+class TestSolveFarm:
+    def test_solve(self):
+        consumed = []
+        with SolveFarm(processes=2) as farm:
+            results = farm.solve(get_states(10, consumed))
+            index, solution = next(results)
+            assert index == 0
+            assert len(consumed) <= 2 * farm.processes + 1
+
+            results = [(index, solution), *results]
+
+        assert [index for index, _ in results] == list(range(10))
+        for (index, solution), state in zip(results, get_states(10, [])):
+            rubiks_cube = RubiksCube(3)
+            rubiks_cube.set_facelets(state)
+            for move in solution:
+                rubiks_cube.rotate(move)
+            assert rubiks_cube.is_finished()
+
+    def test_solve_unordered(self):
+        with SolveFarm(processes=2) as farm:
+            results = list(farm.solve(get_states(6, []), ordered=False))
+        assert sorted(index for index, _ in results) == list(range(6))
+
+    def test_solve_budget(self):
+        rubiks_cube = RubiksCube(3)
+        for move in [Move(Axis.ROW, 0), Move(Axis.COLUMN, 0), Move(Axis.SLICE, 2)]:
+            rubiks_cube.rotate(move)
+        states = [rubiks_cube.get_facelets(), RubiksCube(3).get_facelets()]
+        with SolveFarm(processes=1, max_nodes=2) as farm:
+            results = list(farm.solve(states))
+        assert results == [(0, None), (1, [])]
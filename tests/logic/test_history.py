@@ -0,0 +1,84 @@
+import random
+
+import numpy as np
+import pytest
+
+from logic.enums import Axis
+from logic.history import MoveHistory
+from logic.move import Move
+from logic.rubiks_cube import RubiksCube
+
+
+@pytest.fixture
+def moves():
+    random.seed(0)
+    return [Move(random.choice(list(Axis)), random.randrange(3)) for _ in range(50)]
+
+
+def get_facelets(moves):
+    rubiks_cube = RubiksCube(3)
+    for move in moves:
+        rubiks_cube.rotate(move)
+    return rubiks_cube.facelets
+
+
+class TestMoveHistory:
+    def test_rotate(self, moves):
+        history = MoveHistory(RubiksCube(3), checkpoint_interval=8)
+        for move in moves:
+            history.rotate(move)
+
+        assert len(history) == 50
+        assert history.get_moves() == moves
+        assert np.array_equal(history.rubiks_cube.facelets, get_facelets(moves))
+
+    def test_undo_redo(self, moves):
+        history = MoveHistory(RubiksCube(3))
+        assert history.undo() is None
+        for move in moves[:3]:
+            history.rotate(move)
+
+        assert history.undo() == moves[2]
+        assert np.array_equal(history.rubiks_cube.facelets, get_facelets(moves[:2]))
+        assert history.redo() == moves[2]
+        assert history.redo() is None
+        assert np.array_equal(history.rubiks_cube.facelets, get_facelets(moves[:3]))
+
+    def test_undo_with_cubes(self, moves):
+        history = MoveHistory(RubiksCube(3))
+        history.rubiks_cube.cubes
+        history.rotate(moves[0])
+        history.undo()
+        assert history.rubiks_cube.is_finished()
+        assert history.rubiks_cube.cubes[0, 0, 0] == RubiksCube(3).cubes[0, 0, 0]
+
+    def test_rotate_after_undo_drops_redo(self, moves):
+        history = MoveHistory(RubiksCube(3), checkpoint_interval=4)
+        for move in moves[:10]:
+            history.rotate(move)
+        history.seek(3)
+        history.rotate(moves[20])
+
+        assert history.get_moves() == moves[:3] + [moves[20]]
+        assert history.redo() is None
+        history.seek(4)
+        assert np.array_equal(
+            history.rubiks_cube.facelets, get_facelets(moves[:3] + [moves[20]])
+        )
+
+    @pytest.mark.parametrize("position", [0, 7, 8, 9, 31, 50, 12])
+    def test_seek(self, moves, position):
+        history = MoveHistory(RubiksCube(3), checkpoint_interval=8)
+        for move in moves:
+            history.rotate(move)
+        history.seek(10)
+
+        history.seek(position)
+        assert history.position == position
+        assert np.array_equal(
+            history.rubiks_cube.facelets, get_facelets(moves[:position])
+        )
+
+    def test_seek_out_of_range(self):
+        with pytest.raises(ValueError):
+            MoveHistory(RubiksCube(3)).seek(1)
@@ -0,0 +1,61 @@
+import pytest
+
+from logic.enums import Axis
+from logic.instrumentation import Instrumentation, profile
+from logic.move import Move
+from logic.rubiks_cube import RubiksCube
+
+
+class TestInstrumentation:
+    def test_profile(self):
+        rotate = RubiksCube.rotate
+        rubiks_cube = RubiksCube(3)
+        with profile() as instrumentation:
+            assert RubiksCube.rotate is not rotate
+            rubiks_cube.rotate(Move(Axis.ROW, 0), inverse=True)
+            rubiks_cube.rotate(Move(Axis.SLICE, 1))
+            rubiks_cube.is_finished()
+        assert RubiksCube.rotate is rotate
+
+        # Disabled instrumentations don't record calls
+        rubiks_cube.reset()
+        operations = instrumentation.to_dict()
+        assert operations["RubiksCube.rotate"]["count"] == 2
+        assert operations["RubiksCube.rotate_slice"]["count"] == 1
+        assert operations["RubiksCube.is_finished"]["count"] == 1
+        assert operations["RubiksCube.reset"]["count"] == 0
+
+        stats = operations["RubiksCube.rotate"]
+        assert 0 < stats["p50_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+        assert stats["total_ms"] == pytest.approx(2 * stats["mean_ms"])
+
+    def test_reset(self):
+        with profile() as instrumentation:
+            RubiksCube(2).is_finished()
+            instrumentation.reset()
+            RubiksCube(2).is_finished()
+        assert instrumentation.to_dict()["RubiksCube.is_finished"]["count"] == 1
+
+    def test_already_instrumented(self):
+        is_finished = RubiksCube.is_finished
+        with profile():
+            with pytest.raises(RuntimeError):
+                Instrumentation().enable()
+        assert RubiksCube.is_finished is is_finished
+
+    def test_to_prometheus(self):
+        with profile() as instrumentation:
+            RubiksCube(2).reset()
+        lines = instrumentation.to_prometheus().splitlines()
+        assert "# TYPE rubiks_cube_operation_seconds summary" in lines
+        assert (
+            'rubiks_cube_operation_seconds_count{operation="RubiksCube.reset"} 1'
+            in lines
+        )
+        assert any(
+            line.startswith(
+                'rubiks_cube_operation_seconds{operation="RubiksCube.reset",'
+                'quantile="0.5"} '
+            )
+            for line in lines
+        )
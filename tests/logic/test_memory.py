@@ -0,0 +1,49 @@
+import pytest
+
+from logic.memory import (
+    MAX_MEASURED_SIZE,
+    REPRESENTATIONS,
+    MemoryBudget,
+    get_memory_report,
+    get_state_bytes,
+    measure_state_bytes,
+)
+
+
+class TestMemory:
+    def test_measure_state_bytes(self):
+        assert measure_state_bytes(3, "facelets") == pytest.approx(6 * 9, abs=16)
+        assert measure_state_bytes(3, "packed") == pytest.approx(21, abs=16)
+        with pytest.raises(ValueError):
+            measure_state_bytes(3, "strings")
+
+    def test_get_memory_report(self):
+        report = get_memory_report([2, 3])
+        assert list(report) == list(REPRESENTATIONS)
+        for size in [2, 3]:
+            state_bytes = [report[name][size] for name in REPRESENTATIONS]
+            assert state_bytes == sorted(state_bytes, reverse=True)
+
+    def test_get_state_bytes_extrapolated(self):
+        measured = get_state_bytes(MAX_MEASURED_SIZE, "facelets")
+        assert get_state_bytes(2 * MAX_MEASURED_SIZE, "facelets") == 4 * measured
+
+
+class TestMemoryBudget:
+    def test_check(self):
+        budget = MemoryBudget(100 * get_state_bytes(3, "rubiks_cube"))
+        budget.check(3, 100, "rubiks_cube")
+        with pytest.raises(MemoryError):
+            budget.check(3, 101, "rubiks_cube")
+
+    def test_choose(self):
+        budget = MemoryBudget(100 * get_state_bytes(3, "facelets"))
+        assert budget.choose(3, 100, "facelets") == "facelets"
+        assert budget.choose(3, 100, "cubes") == "facelets"
+        assert budget.choose(3, 150, "cubes") == "packed"
+        with pytest.raises(MemoryError):
+            budget.choose(3, 10**6, "cubes")
+
+    def test_invalid_limit(self):
+        with pytest.raises(ValueError):
+            MemoryBudget(0)
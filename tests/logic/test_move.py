@@ -0,0 +1,30 @@
+import pytest
+
+from logic.enums import Axis
+from logic.move import Move, format_moves, get_random_moves, parse_moves
+
+
+class TestMove:
+    def test_encode_decode(self):
+        for axis in Axis:
+            for number in range(5):
+                move = Move(axis, number)
+                assert Move.decode(move.encode()) == move
+
+    def test_parse(self):
+        assert parse_moves("S0 r2 C1") == [
+            Move(Axis.SLICE, 0),
+            Move(Axis.ROW, 2),
+            Move(Axis.COLUMN, 1),
+        ]
+        assert format_moves(parse_moves("S0 r2 C1")) == "S0 R2 C1"
+
+    @pytest.mark.parametrize("text", ["", "X1", "S", "S-1"])
+    def test_parse_invalid(self, text):
+        with pytest.raises(ValueError):
+            Move.parse(text)
+
+    def test_get_random_moves(self):
+        moves = list(get_random_moves(3, 50))
+        assert len(moves) == 50
+        assert all(0 <= move.number < 3 for move in moves)
@@ -0,0 +1,62 @@
+from logic.enums import Axis
+from logic.move import Move
+from logic.pool import RubiksCubePool
+from logic.rubiks_cube import RubiksCube
+
+
+class TestRubiksCubePool:
+    def test_acquire_release(self):
+        pool = RubiksCubePool()
+        rubiks_cube = pool.acquire(3)
+        rubiks_cube.rotate(Move(Axis.ROW, 0))
+        pool.release(rubiks_cube)
+        assert len(pool) == 1
+
+        acquired = pool.acquire(3)
+        assert acquired is rubiks_cube
+        assert acquired.is_finished()
+        assert len(pool) == 0
+        assert pool.acquire(2).size == 2
+
+    def test_release_twice(self):
+        pool = RubiksCubePool()
+        rubiks_cube = pool.acquire(3)
+        pool.release(rubiks_cube)
+        pool.release(rubiks_cube)
+        assert len(pool) == 1
+
+    def test_max_per_size(self):
+        pool = RubiksCubePool(max_per_size=2)
+        for rubiks_cube in [pool.acquire(3) for _ in range(3)]:
+            pool.release(rubiks_cube)
+        assert len(pool) == 2
+
+    def test_evicts_least_recently_used_size(self):
+        pool = RubiksCubePool(max_sizes=2)
+        pool.release(pool.acquire(2))
+        pool.release(pool.acquire(3))
+        pool.acquire(2)
+        pool.release(pool.acquire(2))
+        pool.release(pool.acquire(4))
+        assert list(pool.idle) == [2, 4]
+
+    def test_full_sizes_are_not_kept(self):
+        pool = RubiksCubePool(max_per_size=0, max_sizes=2)
+        for size in range(1, 8):
+            pool.release(pool.acquire(size))
+        assert not pool.idle
+
+        pool = RubiksCubePool(max_per_size=1, max_sizes=2)
+        pool.release(RubiksCube(2))
+        pool.release(RubiksCube(3))
+        # a full size isn't made more recently used
+        pool.release(RubiksCube(2))
+        pool.release(RubiksCube(4))
+        assert list(pool.idle) == [3, 4]
+
+    def test_context_manager(self):
+        pool = RubiksCubePool()
+        with pool.rubiks_cube(3) as rubiks_cube:
+            rubiks_cube.rotate(Move(Axis.SLICE, 1))
+        assert len(pool) == 1
+        assert pool.acquire(3).is_finished()
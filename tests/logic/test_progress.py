@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from logic.enums import Axis
+from logic.facelets import apply_algorithms, get_solved_facelets
+from logic.move import Move
+from logic.progress import (
+    count_matching_stickers,
+    count_solved_faces,
+    get_progress,
+    get_reference_colors,
+)
+
+
+class TestProgress:
+    @pytest.mark.parametrize("size", [1, 2, 3, 4])
+    def test_solved(self, size):
+        solved = get_solved_facelets(size)
+        progress = get_progress(solved)
+        assert progress.matching_stickers == 6 * size * size
+        assert progress.solved_faces == 6
+        assert progress.solved_cubes == size**3 - max(size - 2, 0) ** 3
+        assert progress.solved_first_layer and progress.solved_first_two_layers
+
+    def test_get_reference_colors(self):
+        for size in [3, 4]:
+            solved = get_solved_facelets(size)
+            assert np.array_equal(get_reference_colors(solved), solved[:, 0, 0])
+
+    def test_top_layer_turned(self):
+        states = apply_algorithms(
+            np.stack([get_solved_facelets(3)] * 2),
+            [[Move(Axis.ROW, 2)], [Move(Axis.ROW, 0)]],
+        )
+        progress = get_progress(states)
+
+        # Turning the top layer keeps the first two layers
+        assert progress.matching_stickers[0] == 54 - 12
+        assert progress.solved_faces[0] == 2
+        assert progress.solved_cubes[0] == 26 - 8
+        assert progress.solved_first_two_layers[0]
+        # Turning the bottom layer breaks them
+        assert not progress.solved_first_layer[1]
+        assert not progress.solved_first_two_layers[1]
+
+    def test_batch_shapes(self):
+        states = np.stack([get_solved_facelets(3)] * 6).reshape(2, 3, 6, 3, 3)
+        assert count_matching_stickers(states).shape == (2, 3)
+        assert count_solved_faces(states).shape == (2, 3)
+        assert all(metric.shape == (2, 3) for metric in get_progress(states))
+
+        for size in [2, 3]:
+            empty = np.empty((0, 6, size, size), dtype=np.uint8)
+            assert count_matching_stickers(empty).shape == (0,)
+            assert count_solved_faces(empty).shape == (0,)
+            assert all(metric.shape == (0,) for metric in get_progress(empty))
@@ -1,7 +1,12 @@
+import subprocess
+import sys
+
+import numpy as np
 import pytest
 
 from logic.cube import Cube
-from logic.enums import Color, Face
+from logic.enums import Axis, Color, Face
+from logic.move import Move
 from logic.rubiks_cube import RubiksCube
 
 
@@ -1143,3 +1148,89 @@ class TestRubiksCube:
         cubes_hash_after = set([hash(cube) for cube in rubiks_cube_3x3.cubes.flatten()])
 
         assert cubes_hash_before == cubes_hash_after
+
+    def test_get_facelets(self, rubiks_cube_3x3):
+        facelets = rubiks_cube_3x3.get_facelets()
+        assert facelets.shape == (6, 3, 3)
+        assert (facelets[0] == list(Color).index(Color.ORANGE)).all()
+        assert (facelets[5] == list(Color).index(Color.YELLOW)).all()
+
+    def test_is_valid(self, rubiks_cube_3x3):
+        assert rubiks_cube_3x3.is_valid()
+
+        rubiks_cube_3x3.rotate_slice(1)
+        assert rubiks_cube_3x3.is_valid()
+
+        facelets = rubiks_cube_3x3.get_facelets()
+        facelets[0, 0, 0], facelets[3, 0, 2] = facelets[3, 0, 2], facelets[0, 0, 0]
+        rubiks_cube_3x3.set_facelets(facelets)
+        assert not rubiks_cube_3x3.is_valid()
+
+    def test_cubes_are_read_only(self, rubiks_cube_3x3):
+        cube = rubiks_cube_3x3.cubes[0, 0, 0]
+        facecolors = dict(cube.facecolors)
+        cube.rotate_xy()
+        assert rubiks_cube_3x3.is_finished()
+
+        # The cubes are only derived again once the Rubik's cube changes
+        rubiks_cube_3x3.reset()
+        assert rubiks_cube_3x3.cubes[0, 0, 0] is cube
+        assert cube.facecolors == facecolors
+
+    def test_cubes_are_cached(self, rubiks_cube_3x3):
+        facecolors = rubiks_cube_3x3.cubes[0, 0, 0].facecolors
+        assert rubiks_cube_3x3.cubes[0, 0, 0].facecolors is facecolors
+
+        for change in [
+            lambda: rubiks_cube_3x3.rotate(Move(Axis.ROW, 0), inverse=True),
+            lambda: rubiks_cube_3x3.rotate_slice(0),
+            lambda: rubiks_cube_3x3.restore(rubiks_cube_3x3.snapshot()),
+        ]:
+            change()
+            assert rubiks_cube_3x3.cubes[0, 0, 0].facecolors is not facecolors
+            facecolors = rubiks_cube_3x3.cubes[0, 0, 0].facecolors
+
+    def test_clone(self, rubiks_cube_3x3):
+        rubiks_cube_3x3.rotate_row(0)
+        clone = rubiks_cube_3x3.clone()
+        assert np.array_equal(clone.facelets, rubiks_cube_3x3.facelets)
+
+        clone.rotate_row(0)
+        assert not np.array_equal(clone.facelets, rubiks_cube_3x3.facelets)
+        assert clone.cubes[0, 0, 0] != rubiks_cube_3x3.cubes[0, 0, 0]
+
+    def test_snapshot_restore(self, rubiks_cube_3x3):
+        rubiks_cube_3x3.rotate_column(1)
+        snapshot = rubiks_cube_3x3.snapshot()
+        facecolors = dict(rubiks_cube_3x3.cubes[0, 0, 0].facecolors)
+
+        rubiks_cube_3x3.rotate_slice(0)
+        rubiks_cube_3x3.restore(snapshot)
+        assert np.array_equal(rubiks_cube_3x3.facelets, snapshot)
+        assert rubiks_cube_3x3.cubes[0, 0, 0].facecolors == facecolors
+
+    def test_snapshot_slots(self, rubiks_cube_3x3):
+        slots = rubiks_cube_3x3.allocate_snapshots(2)
+        rubiks_cube_3x3.snapshot(out=slots[0])
+        rubiks_cube_3x3.rotate_row(1)
+        assert np.shares_memory(rubiks_cube_3x3.snapshot(out=slots[1]), slots)
+
+        rubiks_cube_3x3.restore(slots[0])
+        assert rubiks_cube_3x3.is_finished()
+        rubiks_cube_3x3.restore(slots[1])
+        assert not rubiks_cube_3x3.is_finished()
+
+    def test_rotate(self, rubiks_cube_3x3):
+        rubiks_cube_3x3.rotate(Move(Axis.ROW, 0))
+        expected = RubiksCube(3)
+        expected.rotate_row(0)
+        assert np.array_equal(rubiks_cube_3x3.facelets, expected.facelets)
+
+        rubiks_cube_3x3.rotate(Move(Axis.ROW, 0), inverse=True)
+        assert rubiks_cube_3x3.is_finished()
+
+    def test_imports_without_matplotlib(self):
+        code = (
+            "import sys, logic.rubiks_cube, ui; assert 'matplotlib' not in sys.modules"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,67 @@
+import random
+
+import numpy as np
+import pytest
+
+from logic.enums import Axis
+from logic.facelets import get_solved_facelets
+from logic.move import Move, get_random_moves
+from logic.rubiks_cube import RubiksCube
+from logic.solver import CORNER_STATES, get_corner_distances, get_corner_states, solve
+
+
+class TestSolver:
+    def test_get_corner_distances(self):
+        distances = get_corner_distances()
+        assert distances.shape == (CORNER_STATES,)
+        # distribution of the 2x2x2 cube in the quarter turn metric
+        assert np.bincount(distances).tolist() == [
+            1, 6, 27, 120, 534, 2256, 8969, 33058,
+            114149, 360508, 930588, 1350852, 782536, 90280, 276,
+        ]  # fmt: skip
+
+    def test_get_corner_states_ignores_orientation(self):
+        rubiks_cube = RubiksCube(3)
+        for number in range(3):
+            rubiks_cube.rotate_slice(number)
+        states = np.stack(
+            [get_solved_facelets(3).flatten(), rubiks_cube.facelets.flatten()]
+        )
+        assert get_corner_states(3, states).tolist() == [0, 0]
+
+    @pytest.mark.parametrize("size, scramble", [(2, 30), (3, 5), (4, 3)])
+    def test_solve(self, size, scramble):
+        random.seed(size)
+        rubiks_cube = RubiksCube(size)
+        for move in get_random_moves(size, scramble):
+            rubiks_cube.rotate(move)
+
+        solution = solve(rubiks_cube.get_facelets())
+        assert solution is not None
+        for move in solution:
+            rubiks_cube.rotate(move)
+        assert rubiks_cube.is_finished()
+
+    def test_solve_optimal(self):
+        rubiks_cube = RubiksCube(3)
+        rubiks_cube.rotate(Move(Axis.ROW, 0), inverse=True)
+        assert solve(rubiks_cube.get_facelets()) == [Move(Axis.ROW, 0)]
+        assert solve(RubiksCube(3).get_facelets()) == []
+
+    def test_solve_max_depth(self):
+        rubiks_cube = RubiksCube(3)
+        for move in [Move(Axis.ROW, 0), Move(Axis.COLUMN, 0), Move(Axis.SLICE, 2)]:
+            rubiks_cube.rotate(move)
+        assert solve(rubiks_cube.get_facelets(), max_depth=2) is None
+
+    def test_solve_max_nodes(self):
+        rubiks_cube = RubiksCube(3)
+        for move in [Move(Axis.ROW, 0), Move(Axis.COLUMN, 0), Move(Axis.SLICE, 2)]:
+            rubiks_cube.rotate(move)
+        assert solve(rubiks_cube.get_facelets(), max_nodes=2) is None
+        assert solve(rubiks_cube.get_facelets(), max_nodes=1000) is not None
+
+    def test_solve_invalid(self):
+        facelets = RubiksCube(3).get_facelets()
+        facelets[0, 0, 0], facelets[1, 0, 0] = facelets[1, 0, 0], facelets[0, 0, 0]
+        assert solve(facelets) is None
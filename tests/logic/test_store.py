@@ -0,0 +1,82 @@
+import random
+
+import numpy as np
+import pytest
+
+from logic.facelets import apply_algorithms, get_solved_facelets
+from logic.move import get_random_moves
+from logic.store import NO_MOVE, StateStore
+
+
+def get_records(size, count, seed):
+    random.seed(seed)
+    algorithms = [
+        list(get_random_moves(size, random.randint(0, 6))) for _ in range(count)
+    ]
+    states = apply_algorithms(np.stack([get_solved_facelets(size)] * count), algorithms)
+    return [(state, len(moves), moves) for state, moves in zip(states, algorithms)]
+
+
+class TestStateStore:
+    def test_build_and_lookup(self, tmp_path):
+        records = get_records(3, 500, seed=0)
+        # Small runs and blocks so that several of them are merged
+        store = StateStore.build(tmp_path, 3, records, run_size=64, block_size=8)
+
+        # The shortest distance of the states given more than once is kept
+        expected = {}
+        for state, distance, moves in records:
+            key = state.tobytes()
+            if key not in expected or distance < expected[key][0]:
+                expected[key] = (distance, moves)
+        assert len(store) == len(expected)
+        assert np.all(store.keys[1:] > store.keys[:-1])
+
+        states = np.stack([state for state, _, _ in records])
+        found, distances, solutions = store.lookup(states)
+        assert found.all()
+        for state, distance, solution in zip(states, distances, solutions):
+            assert distance == expected[state.tobytes()][0]
+            assert len(solution[solution != NO_MOVE]) == distance
+
+        assert store.get(records[0][0])[0] == expected[records[0][0].tobytes()][0]
+
+    def test_reopen(self, tmp_path):
+        records = get_records(2, 100, seed=1)
+        built = StateStore.build(tmp_path, 2, records)
+        store = StateStore(tmp_path, index_stride=4)
+        states = np.stack([state for state, _, _ in records])
+        assert np.array_equal(
+            store.lookup(states).distances, built.lookup(states).distances
+        )
+
+    def test_missing_states(self, tmp_path):
+        records = get_records(3, 50, seed=2)
+        store = StateStore.build(tmp_path, 3, records, run_size=16)
+        missing = np.stack([state for state, _, _ in get_records(3, 200, seed=3)])
+        known = {state.tobytes() for state, _, _ in records}
+        found, distances, solutions = store.lookup(missing)
+        assert list(found) == [state.tobytes() in known for state in missing]
+        assert np.all(distances[~found] == 0)
+        assert np.all(solutions[~found] == NO_MOVE)
+
+    def test_empty(self, tmp_path):
+        store = StateStore.build(tmp_path, 3, [])
+        assert len(store) == 0
+        assert store.get(get_solved_facelets(3)) is None
+
+    def test_empty_batch(self, tmp_path):
+        store = StateStore.build(tmp_path, 3, get_records(3, 10, seed=5))
+        found, distances, solutions = store.lookup(np.empty((0, 6, 3, 3), np.uint8))
+        assert found.shape == distances.shape == (0,)
+        assert solutions.shape == (0, store.max_moves)
+
+    def test_invalid(self, tmp_path):
+        records = get_records(3, 10, seed=4)
+        with pytest.raises(ValueError):
+            StateStore.build(tmp_path, 2, records)
+        with pytest.raises(ValueError):
+            StateStore.build(tmp_path, 3, records, max_moves=2)
+        store = StateStore.build(tmp_path, 3, records)
+        with pytest.raises(ValueError):
+            store.lookup(np.stack([get_solved_facelets(2)]))
@@ -0,0 +1,95 @@
+import random
+
+import numpy as np
+import pytest
+
+from logic.enums import Axis
+from logic.facelets import (
+    get_algorithm_permutation,
+    get_center_facelets,
+    get_corner_facelets,
+    get_edge_facelets,
+    get_solved_facelets,
+    get_wing_facelets,
+)
+from logic.move import Move
+from logic.validation import get_state_errors, validate_states
+
+
+def get_scrambled_facelets(size, seed):
+    random.seed(seed)
+    moves = [Move(random.choice(list(Axis)), random.randrange(size)) for _ in range(50)]
+    solved = get_solved_facelets(size).flatten()
+    return solved[get_algorithm_permutation(size, moves)].reshape(-1, size, size)
+
+
+def swap(facelets, first, second):
+    flat = facelets.flatten()
+    flat[[first, second]] = flat[[second, first]]
+    return flat.reshape(facelets.shape)
+
+
+class TestValidation:
+    @pytest.mark.parametrize("size", [1, 2, 3, 4, 5, 6, 7])
+    def test_scrambled_states_are_valid(self, size):
+        states = np.stack([get_scrambled_facelets(size, seed) for seed in range(10)])
+        assert validate_states(states).all()
+        assert get_state_errors(states[0]) == []
+
+    def test_invalid_colors(self):
+        facelets = get_solved_facelets(3).copy()
+        facelets[0, 0, 0] = 6
+        assert "invalid colors" in get_state_errors(facelets)
+
+    def test_wrong_sticker_counts(self):
+        facelets = get_solved_facelets(3).copy()
+        facelets[0, 0, 1] = facelets[1, 0, 0]
+        assert "wrong sticker counts" in get_state_errors(facelets)
+
+    @pytest.mark.parametrize("size", [2, 3, 4])
+    def test_twisted_corner(self, size):
+        facelets = get_scrambled_facelets(size, 0).flatten()
+        corner = get_corner_facelets(size)[0]
+        facelets[corner] = facelets[np.roll(corner, 1)]
+        facelets = facelets.reshape(-1, size, size)
+        assert get_state_errors(facelets) == ["twisted corner"]
+
+    def test_mirrored_corner(self):
+        corner = get_corner_facelets(3)[0]
+        facelets = swap(get_solved_facelets(3), corner[1], corner[2])
+        assert get_state_errors(facelets) == ["invalid corners"]
+
+    def test_flipped_edge(self):
+        edge = get_edge_facelets(5)[3]
+        facelets = swap(get_scrambled_facelets(5, 0), *edge)
+        assert get_state_errors(facelets) == ["flipped edge"]
+
+    def test_swapped_corners(self):
+        first, second = get_corner_facelets(3)[:2]
+        facelets = get_solved_facelets(3).flatten()
+        facelets[first], facelets[second] = facelets[second], facelets[first]
+        facelets = facelets.reshape(-1, 3, 3)
+        assert get_state_errors(facelets) == ["wrong permutation parity"]
+
+    @pytest.mark.parametrize("size", [4, 6])
+    def test_flipped_wing(self, size):
+        wing = get_wing_facelets(size)[-1, 5]
+        facelets = swap(get_scrambled_facelets(size, 1), *wing)
+        assert get_state_errors(facelets) == ["wrong sticker counts", "invalid wings"]
+
+    def test_swapped_centers(self):
+        top, bottom = get_center_facelets(3)[[5, 4]]
+        facelets = swap(get_solved_facelets(3), top, bottom)
+        assert "invalid centers" in get_state_errors(facelets)
+
+    def test_validate_states_batch(self):
+        valid = get_scrambled_facelets(3, 2)
+        corner = get_corner_facelets(3)[0]
+        invalid = swap(valid, corner[0], corner[1])
+        assert validate_states(np.stack([valid, invalid, valid])).tolist() == [
+            True,
+            False,
+            True,
+        ]
+        empty = validate_states(np.empty((0, 6, 3, 3), dtype=np.uint8))
+        assert empty.shape == (0,) and empty.dtype == bool
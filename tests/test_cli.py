@@ -0,0 +1,123 @@
+import io
+import json
+import sys
+
+import numpy as np
+import pytest
+
+from cli import main
+from logic.enums import Axis
+from logic.facelet_string import to_facelet_string
+from logic.facelets import apply_algorithms, get_solved_facelets
+from logic.move import Move
+
+SOLVED_2 = to_facelet_string(get_solved_facelets(2))
+SOLVED_3 = to_facelet_string(get_solved_facelets(3))
+
+
+def run(monkeypatch, argv, lines=()):
+    stdout = io.StringIO()
+    monkeypatch.setattr(
+        sys, "stdin", io.StringIO("".join(f"{line}\n" for line in lines))
+    )
+    monkeypatch.setattr(sys, "stdout", stdout)
+    main(argv)
+    return [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+
+def get_state(size, moves):
+    states = apply_algorithms(get_solved_facelets(size)[np.newaxis], [moves])
+    return to_facelet_string(states[0])
+
+
+class TestCli:
+    def test_scramble(self, monkeypatch):
+        records = run(
+            monkeypatch, ["scramble", "--size", "2", "--moves", "5", "--count", "3"]
+        )
+        assert len(records) == 3
+        for record in records:
+            assert len(record["moves"].split()) == 5
+            assert len(record["state"]) == len(SOLVED_2)
+
+        seeded = ["scramble", "--count", "2", "--seed", "1"]
+        assert run(monkeypatch, seeded) == run(monkeypatch, seeded)
+
+    def test_apply(self, monkeypatch):
+        records = run(
+            monkeypatch,
+            ["apply", "--size", "3", "--batch-size", "2"],
+            [
+                "R0",
+                json.dumps({"moves": "R0", "state": SOLVED_2}),
+                json.dumps({"moves": "C2"}),
+                json.dumps({"moves": "C2", "state": SOLVED_2}),
+                json.dumps({"moves": "X1"}),
+                "{not json",
+            ],
+        )
+        assert records[0] == {
+            "state": get_state(3, [Move(Axis.ROW, 0)]),
+            "finished": False,
+        }
+        # States of another size than the default in the same batch
+        assert records[1] == {
+            "state": get_state(2, [Move(Axis.ROW, 0)]),
+            "finished": False,
+        }
+        assert records[2]["state"] == get_state(3, [Move(Axis.COLUMN, 2)])
+        assert "below 2" in records[3]["error"]
+        assert "error" in records[4]
+        assert records[5]["error"].startswith("invalid JSON")
+
+    def test_verify(self, monkeypatch):
+        swapped = "R" + SOLVED_3[1:9] + "U" + SOLVED_3[10:]
+        records = run(
+            monkeypatch,
+            ["verify"],
+            [SOLVED_3, SOLVED_2, swapped, json.dumps({}), "UUU"],
+        )
+        assert records[0] == {"state": SOLVED_3, "valid": True, "errors": []}
+        assert records[1]["valid"]
+        assert not records[2]["valid"] and records[2]["errors"]
+        assert records[3] == {"error": "missing state"}
+        assert "error" in records[4]
+
+    def test_solve(self, monkeypatch):
+        state = get_state(3, [Move(Axis.ROW, 0)] * 3)
+        records = run(
+            monkeypatch,
+            ["solve", "--max-depth", "3"],
+            [state, SOLVED_2, json.dumps({"moves": "R0"})],
+        )
+        assert records[0] == {"state": state, "solution": "R0"}
+        assert records[1] == {"state": SOLVED_2, "solution": ""}
+        assert records[2] == {"moves": "R0", "error": "missing state"}
+
+    def test_solve_budget(self, monkeypatch):
+        moves = [Move(Axis.ROW, 0), Move(Axis.COLUMN, 0), Move(Axis.SLICE, 2)]
+        records = run(monkeypatch, ["solve", "--max-nodes", "2"], [get_state(3, moves)])
+        assert records[0]["solution"] is None
+
+    def test_stats(self, monkeypatch):
+        records = run(
+            monkeypatch, ["stats", "--size", "3"], ["R0", "C2 R2", "R5", "Q1"]
+        )
+        assert records[0] == {"moves": "R0", "order": 4, "cycles": [4] * 5}
+        assert records[1]["order"] == 105
+        assert "error" in records[2]
+        assert "error" in records[3]
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["apply", "--batch-size", "0"],
+            ["stats", "--size", "0"],
+            ["scramble", "--size", "-1"],
+            ["verify", "--batch-size", "x"],
+        ],
+    )
+    def test_invalid_arguments(self, monkeypatch, capsys, argv):
+        with pytest.raises(SystemExit) as error:
+            run(monkeypatch, argv, ["R0"])
+        assert error.value.code == 2
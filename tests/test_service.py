@@ -0,0 +1,159 @@
+import asyncio
+import json
+
+from service import (
+    INTERNAL_ERROR,
+    INVALID_PARAMS,
+    METHOD_NOT_FOUND,
+    SERVER_ERROR,
+    CubeService,
+)
+
+SOLVED_STATE = "U" * 9 + "R" * 9 + "F" * 9 + "D" * 9 + "L" * 9 + "B" * 9
+
+
+async def call(reader, writer, message):
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+def request(request_id, method, **params):
+    return {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+
+
+def run_with_service(test, service=None):
+    async def run():
+        nonlocal service
+        service = service or CubeService()
+        server = await asyncio.start_server(service.handle_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            await test(reader, writer)
+        finally:
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            service.executor.shutdown()
+
+    asyncio.run(run())
+
+
+class TestCubeService:
+    def test_session(self):
+        async def test(reader, writer):
+            response = await call(
+                reader, writer, request(1, "create", session="a", size=3)
+            )
+            assert response == {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "result": {"state": SOLVED_STATE, "finished": True},
+            }
+
+            response = await call(
+                reader, writer, request(2, "move", session="a", moves="R0")
+            )
+            assert not response["result"]["finished"]
+
+            response = await call(reader, writer, request(3, "solve", session="a"))
+            assert response["result"] == "R0 R0 R0"
+
+            response = await call(reader, writer, request(4, "query", session="a"))
+            assert response["result"]["valid"]
+
+            await call(reader, writer, request(5, "delete", session="a"))
+            response = await call(reader, writer, request(6, "query", session="a"))
+            assert response["error"]["code"] == SERVER_ERROR
+
+        run_with_service(test)
+
+    def test_batch(self):
+        async def test(reader, writer):
+            responses = await call(
+                reader,
+                writer,
+                [
+                    request(1, "create", session="b", size=2),
+                    {"jsonrpc": "2.0", "method": "stats"},
+                    request(2, "unknown"),
+                    request(3, "create", session="c", size=0),
+                ],
+            )
+            assert [response["id"] for response in responses] == [1, 2, 3]
+            assert responses[1]["error"]["code"] == METHOD_NOT_FOUND
+            assert responses[2]["error"]["code"] == INVALID_PARAMS
+
+            response = await call(reader, writer, request(4, "stats"))
+            assert response["result"]["create"]["count"] == 2
+
+        run_with_service(test)
+
+    def test_invalid_params_in_batch(self):
+        async def test(reader, writer):
+            await call(reader, writer, request(1, "create", session="d", size=3))
+            responses = await call(
+                reader,
+                writer,
+                [
+                    request(2, "move", session="d", moves=5),
+                    request(3, "move", session="d", moves=None),
+                    request(4, "move", session="d", moves="S1"),
+                    request(5, "create", session="e", size=True),
+                ],
+            )
+            assert [response["id"] for response in responses] == [2, 3, 4, 5]
+            assert responses[0]["error"]["code"] == INVALID_PARAMS
+            assert responses[1]["error"]["code"] == INVALID_PARAMS
+            assert not responses[2]["result"]["finished"]
+            assert responses[3]["error"]["code"] == INVALID_PARAMS
+
+            # The connection is still served
+            response = await call(reader, writer, request(6, "query", session="d"))
+            assert response["result"]["valid"]
+
+        run_with_service(test)
+
+    def test_solve_budget(self):
+        async def test(reader, writer):
+            await call(reader, writer, request(1, "create", session="g", size=3))
+            await call(
+                reader, writer, request(2, "move", session="g", moves="R0 C0 S2 R1")
+            )
+            response = await call(reader, writer, request(3, "solve", session="g"))
+            assert response["result"] is None
+
+            response = await call(
+                reader, writer, request(4, "solve", session="g", max_depth=100)
+            )
+            assert response["error"]["code"] == INVALID_PARAMS
+
+        run_with_service(test, CubeService(max_nodes=2))
+
+    def test_size_over_memory_budget(self):
+        async def test(reader, writer):
+            response = await call(
+                reader, writer, request(1, "create", session="h", size=10**9)
+            )
+            assert response["error"]["code"] == INVALID_PARAMS
+            assert "over the limit" in response["error"]["message"]
+
+        run_with_service(test)
+
+    def test_internal_error(self):
+        async def fail():
+            raise RuntimeError("failure")
+
+        async def test(reader, writer):
+            response = await call(reader, writer, request(1, "fail"))
+            assert response["error"] == {
+                "code": INTERNAL_ERROR,
+                "message": "internal error: RuntimeError",
+            }
+            response = await call(reader, writer, request(2, "stats"))
+            assert response["result"]["fail"]["count"] == 1
+
+        service = CubeService()
+        service.methods["fail"] = fail
+        run_with_service(test, service)
@@ -0,0 +1,77 @@
+import time
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import settings
+from logic.enums import Axis
+from logic.move import Move
+from logic.rubiks_cube import RubiksCube
+from ui.display import RubiksCubeDisplay
+
+MOVES = [Move(Axis.ROW, 0), Move(Axis.COLUMN, 1), Move(Axis.SLICE, 2)] * 3 + [
+    Move(Axis.ROW, 1)
+]
+
+
+def get_display():
+    figure = Figure(figsize=(1, 1), dpi=20)
+    FigureCanvasAgg(figure)
+    display = RubiksCubeDisplay(RubiksCube(3), 0.3, 4, figure=figure)
+    display._add_cubes_to_ax()
+    return display
+
+
+def count_draws(monkeypatch, display):
+    draws = []
+    draw = display.fig.canvas.draw
+    monkeypatch.setattr(display.fig.canvas, "draw", lambda: draws.append(draw()))
+    return draws
+
+
+def get_expected(moves):
+    rubiks_cube = RubiksCube(3)
+    for move in moves:
+        rubiks_cube.rotate(move)
+    return rubiks_cube.facelets
+
+
+class TestRubiksCubeDisplay:
+    def test_update_catches_up_with_one_draw(self, monkeypatch):
+        display = get_display()
+        draws = count_draws(monkeypatch, display)
+        display.queue_moves(MOVES)
+
+        monkeypatch.setattr(time, "perf_counter", lambda: 0.0)
+        display._update()
+        assert display.current_move == MOVES[0]
+        assert len(draws) == 1
+
+        # After a stall, the moves that ended are snapped and only the one
+        # still turning is drawn
+        stall = (len(MOVES) - 0.5) * settings.ROTATION_DURATION
+        monkeypatch.setattr(time, "perf_counter", lambda: stall)
+        display._update()
+        assert display.current_move == MOVES[-1]
+        assert not display.pending_moves
+        assert len(draws) == 2
+        assert np.array_equal(display.rubiks_cube.facelets, get_expected(MOVES))
+
+    def test_update_snaps_all_ended_moves(self, monkeypatch):
+        display = get_display()
+        draws = count_draws(monkeypatch, display)
+        monkeypatch.setattr(time, "perf_counter", lambda: 0.0)
+        display.queue_moves(MOVES[:1])
+        display._update()
+
+        display.queue_moves(MOVES[1:])
+        stall = (len(MOVES) + 1) * settings.ROTATION_DURATION
+        monkeypatch.setattr(time, "perf_counter", lambda: stall)
+        display._update()
+        assert display.current_move is None
+        # the start of the first move, then the final state once
+        assert len(draws) == 2
+        assert np.array_equal(display.rubiks_cube.facelets, get_expected(MOVES))
+        assert np.array_equal(display.verts, display.grid_verts)
+        assert display.static_faces.all()
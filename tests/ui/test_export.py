@@ -0,0 +1,192 @@
+import os
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+from matplotlib import image
+
+from logic.enums import Axis
+from logic.move import Move
+from logic.rubiks_cube import RubiksCube
+from ui import export
+from ui.export import (
+    NO_MOVE,
+    FrameRenderer,
+    _encode_video,
+    export_moves,
+    get_frames,
+    render_frames,
+)
+
+MOVES = [Move(Axis.ROW, 0), Move(Axis.COLUMN, 1)]
+NUMBER_OF_FRAMES = 2
+FIGSIZE = (1, 1)
+DPI = 20
+
+
+class FakeStdin:
+    def __init__(self, process):
+        self.process = process
+        self.data = []
+        self.closed = False
+
+    def write(self, data):
+        if self.process.breaks_after is not None:
+            if len(self.data) == self.process.breaks_after:
+                raise BrokenPipeError
+        self.data.append(data)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeProcess:
+    # Stands for ffmpeg, failing after reading `breaks_after` frames
+    processes = []
+    breaks_after = None
+
+    def __init__(self, command, stdin):
+        assert stdin == subprocess.PIPE
+        self.command = command
+        self.stdin = FakeStdin(self)
+        self.returncode = None
+        FakeProcess.processes.append(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.returncode = 0 if self.breaks_after is None else 1
+
+
+def get_expected_frames(moves):
+    # Frames rendered one after the other in this process
+    states, frames = get_frames(RubiksCube(2), moves, NUMBER_OF_FRAMES)
+    renderer = FrameRenderer(2, 0.3, NUMBER_OF_FRAMES, FIGSIZE, DPI)
+    return [
+        renderer.render(
+            states[state], None if code == NO_MOVE else Move.decode(code), step
+        )
+        for state, code, step in frames
+    ]
+
+
+def render(moves, **kwargs):
+    return render_frames(
+        RubiksCube(2),
+        moves,
+        0.3,
+        NUMBER_OF_FRAMES,
+        figsize=FIGSIZE,
+        dpi=DPI,
+        processes=1,
+        **kwargs,
+    )
+
+
+class TestExport:
+    def test_get_frames(self):
+        rubiks_cube = RubiksCube(2)
+        states, frames = get_frames(rubiks_cube, MOVES, 3)
+        assert rubiks_cube.is_finished()
+
+        assert len(states) == len(MOVES) + 1
+        assert np.array_equal(states[0], RubiksCube(2).facelets)
+        for move in MOVES:
+            rubiks_cube.rotate(move)
+        assert np.array_equal(states[-1], rubiks_cube.facelets)
+
+        assert frames.tolist() == [
+            [0, MOVES[0].encode(), 0],
+            [0, MOVES[0].encode(), 1],
+            [0, MOVES[0].encode(), 2],
+            [1, MOVES[1].encode(), 0],
+            [1, MOVES[1].encode(), 1],
+            [1, MOVES[1].encode(), 2],
+            [2, NO_MOVE, 0],
+        ]
+
+    def test_render_frames(self):
+        frames = list(render(MOVES, chunk_size=3))
+        expected = get_expected_frames(MOVES)
+        assert len(frames) == len(MOVES) * NUMBER_OF_FRAMES + 1
+        assert all(np.array_equal(a, b) for a, b in zip(frames, expected))
+        # each move turns the layer away from the state before it
+        assert not np.array_equal(frames[0], frames[1])
+
+        final = RubiksCube(2)
+        for move in MOVES:
+            final.rotate(move)
+        renderer = FrameRenderer(2, 0.3, NUMBER_OF_FRAMES, FIGSIZE, DPI)
+        assert np.array_equal(frames[-1], renderer.render(final.facelets))
+
+    def test_render_frames_bounds_chunks_in_flight(self, monkeypatch):
+        submitted = []
+
+        class Executor(export.ProcessPoolExecutor):
+            def submit(self, *args, **kwargs):
+                submitted.append(args)
+                return super().submit(*args, **kwargs)
+
+        monkeypatch.setattr(export, "ProcessPoolExecutor", Executor)
+        frames = render(MOVES * 2, chunk_size=1)
+        next(frames)
+        # two chunks per process, and the one replacing the chunk yielded
+        assert len(submitted) == 3
+        assert len(list(frames)) == len(MOVES) * 2 * NUMBER_OF_FRAMES
+        assert len(submitted) == len(MOVES) * 2 * NUMBER_OF_FRAMES + 1
+
+    def test_export_moves_to_pngs(self, tmp_path):
+        directory = tmp_path / "frames"
+        export_moves(
+            directory,
+            RubiksCube(2),
+            MOVES,
+            0.3,
+            NUMBER_OF_FRAMES,
+            figsize=FIGSIZE,
+            dpi=DPI,
+            processes=1,
+        )
+
+        expected = get_expected_frames(MOVES)
+        names = sorted(os.listdir(directory))
+        assert names == [f"frame_{index:05d}.png" for index in range(len(expected))]
+        for name, frame in zip(names, expected):
+            read = image.imread(directory / name)[..., :3]
+            assert np.array_equal(np.round(read * 255).astype(np.uint8), frame)
+
+    def test_encode_video_without_ffmpeg(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(shutil, "which", lambda name: None)
+        with pytest.raises(RuntimeError, match="ffmpeg"):
+            _encode_video(tmp_path / "moves.gif", iter([]), 30)
+
+    @pytest.mark.parametrize("extension", [".gif", ".mp4"])
+    def test_encode_video(self, tmp_path, monkeypatch, extension):
+        monkeypatch.setattr(shutil, "which", lambda name: "/usr/bin/ffmpeg")
+        monkeypatch.setattr(subprocess, "Popen", FakeProcess)
+        monkeypatch.setattr(FakeProcess, "processes", [])
+        rng = np.random.default_rng(0)
+        frames = [rng.integers(256, size=(4, 6, 3), dtype=np.uint8) for _ in range(3)]
+        path = tmp_path / f"moves{extension}"
+        _encode_video(path, iter(frames), 24)
+
+        (process,) = FakeProcess.processes
+        command = process.command
+        assert command[0] == "/usr/bin/ffmpeg"
+        assert command[command.index("-s") + 1] == "6x4"
+        assert command[command.index("-r") + 1] == "24"
+        assert command[command.index("-pix_fmt") + 1] == "rgb24"
+        assert command[-1] == os.fspath(path)
+        assert ("yuv420p" in command) == (extension == ".mp4")
+        assert process.stdin.data == [frame.tobytes() for frame in frames]
+        assert process.stdin.closed
+
+    def test_encode_video_ffmpeg_exits_early(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(shutil, "which", lambda name: "/usr/bin/ffmpeg")
+        monkeypatch.setattr(subprocess, "Popen", FakeProcess)
+        monkeypatch.setattr(FakeProcess, "breaks_after", 1)
+        frames = iter([np.zeros((4, 6, 3), dtype=np.uint8)] * 3)
+        with pytest.raises(RuntimeError, match="code 1"):
+            _encode_video(tmp_path / "moves.gif", frames, 24)